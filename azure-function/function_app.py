@@ -262,21 +262,56 @@ class NSPMCPConnector:
     
     def __init__(self):
         self.local_api_base = LOCAL_API_BASE.rstrip('/')
+        self._client = None
+        self._client_loop = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use or if the event loop has changed"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._discard_client()
+            # One long-lived client keeps connections to the local API alive between tool calls
+            self._client = httpx.AsyncClient(timeout=30.0)
+            self._client_loop = loop
+        return self._client
+    
+    def _discard_client(self):
+        """Release the current client, closing it on the event loop it was created on"""
+        client, loop = self._client, self._client_loop
+        self._client = None
+        self._client_loop = None
+        if client is None or client.is_closed:
+            return
+        if loop is not None and loop.is_running() and loop is not asyncio.get_running_loop():
+            # The client's connections belong to its own loop, so close it there
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        else:
+            logger.debug("Dropping HTTP client from an event loop that is no longer running")
+    
+    async def aclose(self):
+        """Close the shared HTTP client (call on shutdown)"""
+        if self._client is not None and self._client_loop is asyncio.get_running_loop():
+            client = self._client
+            self._client = None
+            self._client_loop = None
+            await client.aclose()
+        else:
+            self._discard_client()
     
     async def _call_local_api(self, endpoint: str, method: str = 'POST', data: Dict = None) -> Dict[str, Any]:
         """Call local REST API"""
         url = f"{self.local_api_base}{endpoint}"
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                if method.upper() == 'GET':
-                    response = await client.get(url)
-                else:
-                    response = await client.post(url, json=data)
-                
-                response.raise_for_status()
-                return response.json()
-                
+            client = self._get_client()
+            if method.upper() == 'GET':
+                response = await client.get(url)
+            else:
+                response = await client.post(url, json=data)
+            
+            response.raise_for_status()
+            return response.json()
+            
         except Exception as e:
             logger.error(f"Error calling local API: {str(e)}")
             raise
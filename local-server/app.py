@@ -8,12 +8,13 @@ from flask_cors import CORS
 import logging
 import os
 from dotenv import load_dotenv
-from nsp_client import NSPClient
-from token_prewarming import SmartTokenWarmer
 
-# Load environment variables
+# Load environment variables (before the local imports, which read their configuration at import time)
 load_dotenv()
 
+from nsp_client import NSPClient
+from token_prewarming import SmartTokenWarmer
+
 # Configure logging
 logging.basicConfig(
     level=getattr(logging, os.getenv('LOG_LEVEL', 'INFO').strip()),
@@ -44,6 +45,10 @@ if os.getenv('PREWARMING_ENABLED', 'true').lower() == 'true':
 else:
     logger.info("Token pre-warming disabled via PREWARMING_ENABLED=false")
 
+# Fetch the ticket lookup tables (priorities, statuses, groups, sources, forms) in the background
+# so the first ticket creation doesn't have to wait for them
+nsp_client.start_lookup_cache_warming()
+
 @app.before_request
 def authenticate_if_needed():
     """Authenticate against NSP if token is missing or expired"""
@@ -125,10 +130,12 @@ def get_tickets():
         sort_by = data.get('sort_by', 'CreatedDate')
         sort_direction = data.get('sort_direction', 'desc')  # Default to desc for newest first
         ticket_types = data.get('ticket_types')  # Optional: specific IT ticket types
+        columns = data.get('columns')  # Optional: only return these ticket columns
         
         logger.info(f"Fetching IT tickets: page={page}, page_size={page_size}, sort_by={sort_by}, sort_direction={sort_direction}, types={ticket_types}")
         
-        result = nsp_client.get_it_tickets(page, page_size, filters, sort_by, sort_direction, ticket_types)
+        result = nsp_client.get_it_tickets(page, page_size, filters, sort_by, sort_direction, ticket_types,
+                                           projection=columns)
         
         return jsonify({
             "success": True,
@@ -5,108 +5,299 @@ Based on insights from NSP.PublicApiDemoForm
 
 import requests
 import json
+import re
+import copy
+import orjson
+import heapq
+import math
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 from datetime import datetime, timezone, timedelta
 import time
 import threading
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+def _is_transient_error(exception: BaseException) -> bool:
+    """Check if a request failure is worth retrying (connection problems, timeouts and 5xx responses)"""
+    if isinstance(exception, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(exception, requests.exceptions.HTTPError) and exception.response is not None:
+        return exception.response.status_code >= 500
+    return False
+
+# Map IT ticket type names to their numeric IDs
+_IT_TICKET_TYPE_IDS = {
+    'IT Request': 112,
+    'ServiceOrderRequest': 113,
+    'Incident Management': 281
+}
+
+# Type filter for all IT ticket types - built once and reused when no specific types are requested
+_DEFAULT_TYPE_FILTER = {
+    "logic": "or",
+    "filters": [
+        {"field": "Type", "operator": "eq", "value": type_id}
+        for type_id in _IT_TICKET_TYPE_IDS.values()
+    ]
+}
+
+# Simple-format status filters for get_it_tickets_by_status (treated as read-only)
+_STATUS_FILTERS = {
+    "open": {"BaseEntityStatus": [1, 3, 6, 9]},  # Not closed statuses
+    "closed": {"BaseEntityStatus": [10, 11]}  # Resolved, Closed
+}
+
+# Full SysTicket column list (explicit columns work around NSP's SortOrder issue)
+_TICKET_COLUMNS = [
+    "Type", "Owner", "Version", "CreatedDate", "CreatedBy", "UpdatedDate", "UpdatedBy", 
+    "IPAddress", "BaseStatus", "OwnerAgent", "CC", "Priority", "Category", "Callback", 
+    "CloseDateTime", "AgentGroup", "EndUserRating", "IsMajor", "BaseEntitySource", 
+    "GeoLocation", "BrowserName", "ReferenceNo", "BaseEntityStage", "Escalation", 
+    "Resolution", "BaseEntitySecurity", "IsSecurity", "FormId", "CaseType", "ReportedBy", 
+    "OnBehalfOf", "BaseEndUser", "BaseAgent", "BaseHeader", "BaseDescription", 
+    "BaseEntityStatus", "Location", "Customer", "SspFormId", "RequesterCommentCount", 
+    "EndUserCommentCount", "SlaSummary", "MainWaypoint", "Urgency", "Impact", "AssignedDate", 
+    "Address", "CommentCount", "LastCommentUserType", "ServiceEntitiesCount", "CiCount", 
+    "TaskCount", "TicketOrganization", "ScenarioName", "EntitySerialNumber", "ConversationId", 
+    "ServiceOrderItemId", "MasterTicket", "DependentParent", "IsInvoiceable", "IsInvoicingDecisionMade", 
+    "ServiceCiId", "ServiceCiCategoryId", "SlaStartTimeCounter", "JiraIssueKey", "MetaDataOrderInfoId", 
+    "StartMeetingTime", "EndMeetingTime", "RecipientAs", "AttachmentCount", "CiId", "CrmReference", 
+    "MarkedForDelete", "EmailOrigin", "IsClosedFromSsp"
+]
+
+# Person lookup by email (the Email filter is added per call). These are the columns
+# /api/get_user_by_email has always returned, so the public user payload keeps every field
+_USER_QUERY_TEMPLATE = {
+    "EntityType": "Person",
+    "columns": [
+        "Type", "Owner", "Version", "CreatedDate", "CreatedBy", "UpdatedDate", "UpdatedBy", 
+        "IPAddress", "BaseStatus", "LastLoginTime", "UserTypeId", "Email", "PasswordMD5HexHash", 
+        "LastPwdDate", "IsActive", "IsLicensed", "DisplayName", "AuthToken", "AuthTokenGeneratedOn", 
+        "WindowsUserName", "WindowsSidString", "LdapServerId", "Room", "CostCenter", "IsVIP", 
+        "VIPNotes", "FirstName", "LastName", "EMailAddress", "Phone", "MobilePhone", "Address", 
+        "Department", "JobTitle", "PersonTitle", "DateOfBirth", "Image", "FullName", "Organization", 
+        "SysLanguage", "MaxStorage", "Description", "Comment", "Notes", "Company", "FaxNumber", 
+        "HomeFolder", "HomeDrive", "HomePhone", "HomeAddress", "IpPhoneNumber", "Manager", 
+        "PagerNumber", "WebPageAddress", "LyncAddress", "PhoneClean", "MobilePhoneClean", 
+        "SkypeName", "MemberOf", "RoomNumber", "OfficeLocation", "ExtraCustomField1", 
+        "ExtraCustomField2", "ExtraCustomField3", "DoNotSendEmailNotification", "LyncTel", 
+        "AdManagerUserId", "SwedishPersonalNumber", "NormalizedSwedishPersonalNumber", 
+        "NorwegianPid", "ExternalId", "DoNotSendApprovalNotification", "u_Rrelsegrenkostnadsstlle", 
+        "u_Mailnotifieringvidnyttrende"
+    ],
+    "Page": 1,
+    "PageSize": 1  # Emails are unique, so the server-side filter returns at most one match
+}
+
+# Internal email -> ID resolution for ticket queries only needs these two columns
+_USER_ID_QUERY_TEMPLATE = {
+    "EntityType": "Person",
+    "columns": ["Id", "Email"],
+    "Page": 1,
+    "PageSize": 1
+}
+
+# How long a caller waits for another thread's lookup of the same user before fetching it itself
+_USER_LOOKUP_WAIT_SECONDS = 30
+
+# Short forms accepted for common priority words
+_PRIORITY_ABBREVIATIONS = {
+    "low": ("lo",),
+    "medium": ("med",),
+    "high": ("hi",),
+    "critical": ("crit",)
+}
+
+def _build_priority_aliases(priority_ids: Dict[str, int]) -> Dict[str, int]:
+    """Map each word of the priority names (plus common short forms) to its priority ID"""
+    aliases = {}
+    for name, priority_id in priority_ids.items():
+        for word in re.findall(r'\w+', name):
+            aliases.setdefault(word, priority_id)
+            for abbreviation in _PRIORITY_ABBREVIATIONS.get(word, ()):
+                aliases.setdefault(abbreviation, priority_id)
+    return aliases
+
+def _default_source_id(source_ids: Dict[str, int]) -> int:
+    """Pick the default ticket source ID"""
+    # Use Microsoft Chat Bot as source since we're creating tickets via AI assistant
+    default_source_id = source_ids.get('microsoft chat bot', 16)  # ID 16 for Microsoft Chat Bot
+    if not default_source_id:
+        # Fallback to API if Microsoft Chat Bot not found
+        default_source_id = source_ids.get('api', 24)  # ID 24 for API
+        if not default_source_id:
+            # Final fallback to first available source
+            default_source_id = next(iter(source_ids.values()), 1)
+    return default_source_id
+
+def _decode_json(response: requests.Response) -> Any:
+    """Parse a JSON response body with orjson (much faster than stdlib json on large ticket pages)"""
+    return orjson.loads(response.content)
+
 @dataclass
 class CachedUser:
     """Represents a cached user lookup result"""
     user_data: Dict[str, Any]
     cached_at: datetime
     email: str
+    expires_at: float  # time.monotonic() deadline, computed once when stored
 
-    def is_expired(self, ttl_minutes: int = 30) -> bool:
+    def is_expired(self) -> bool:
         """Check if cache entry is expired"""
-        age = datetime.now(timezone.utc) - self.cached_at
-        return age > timedelta(minutes=ttl_minutes)
+        return time.monotonic() > self.expires_at
 
 class UserCache:
-    """Thread-safe cache for user lookups"""
+    """Thread-safe cache for user lookups, sharded by email so writers for different users don't contend"""
+    
+    SHARD_COUNT = 8
     
     def __init__(self, ttl_minutes: int = 30, max_size: int = 100):
-        self._cache: Dict[str, CachedUser] = {}
-        self._lock = threading.RLock()
+        self._shards: List[Dict[str, CachedUser]] = [{} for _ in range(self.SHARD_COUNT)]
+        self._locks = [threading.Lock() for _ in range(self.SHARD_COUNT)]
         self.ttl_minutes = ttl_minutes
         self.max_size = max_size
+        # Size limit is enforced per shard. Each shard gets twice its even share so uneven hashing
+        # doesn't evict users early; the cache as a whole may hold up to about 2 * max_size entries
+        self._shard_max_size = math.ceil(max_size / self.SHARD_COUNT) * 2
+    
+    def _shard(self, email_key: str) -> int:
+        """Get the shard index for a (lowercased) email"""
+        return hash(email_key) % self.SHARD_COUNT
         
     def get(self, email: str) -> Optional[Dict[str, Any]]:
         """Get user from cache if exists and not expired"""
-        with self._lock:
-            email_key = email.lower()
-            if email_key in self._cache:
-                cached_user = self._cache[email_key]
-                if not cached_user.is_expired(self.ttl_minutes):
-                    logger.debug(f"Cache HIT for user: {email}")
-                    return cached_user.user_data
-                else:
-                    # Remove expired entry
-                    logger.debug(f"Cache EXPIRED for user: {email}")
-                    del self._cache[email_key]
+        email_key = email.lower()
+        index = self._shard(email_key)
+        # Reads are lock-free (dict.get is atomic in CPython); only writers take the shard lock
+        cached_user = self._shards[index].get(email_key)
+        if cached_user is not None:
+            if not cached_user.is_expired():
+                logger.debug(f"Cache HIT for user: {email}")
+                return cached_user.user_data
             
-            logger.debug(f"Cache MISS for user: {email}")
-            return None
+            # Remove expired entry, unless another thread has already replaced it
+            logger.debug(f"Cache EXPIRED for user: {email}")
+            with self._locks[index]:
+                shard = self._shards[index]
+                if shard.get(email_key) is cached_user:
+                    del shard[email_key]
+        
+        logger.debug(f"Cache MISS for user: {email}")
+        return None
     
     def put(self, email: str, user_data: Dict[str, Any]) -> None:
         """Store user in cache"""
-        with self._lock:
-            # Clean up if we're at max size
-            if len(self._cache) >= self.max_size:
-                self._cleanup_oldest()
+        email_key = email.lower()
+        index = self._shard(email_key)
+        shard = self._shards[index]
+        with self._locks[index]:
+            # Clean up if this shard is at max size
+            if len(shard) >= self._shard_max_size:
+                self._cleanup_oldest(shard)
             
-            email_key = email.lower()
-            self._cache[email_key] = CachedUser(
+            shard[email_key] = CachedUser(
                 user_data=user_data,
                 cached_at=datetime.now(timezone.utc),
-                email=email
+                email=email,
+                expires_at=time.monotonic() + self.ttl_minutes * 60
             )
             logger.debug(f"Cache STORE for user: {email}")
     
-    def _cleanup_oldest(self) -> None:
-        """Remove oldest cache entries to make room"""
-        if not self._cache:
+    def _cleanup_oldest(self, shard: Dict[str, CachedUser]) -> None:
+        """Remove oldest entries from a shard to make room (caller holds the shard lock)"""
+        if not shard:
             return
             
         # Remove oldest 25% of entries
-        entries_to_remove = max(1, len(self._cache) // 4)
-        oldest_keys = sorted(
-            self._cache.keys(), 
-            key=lambda k: self._cache[k].cached_at
-        )[:entries_to_remove]
+        entries_to_remove = max(1, len(shard) // 4)
+        oldest_keys = heapq.nsmallest(
+            entries_to_remove,
+            shard,
+            key=lambda k: shard[k].cached_at
+        )
         
         for key in oldest_keys:
-            del self._cache[key]
+            del shard[key]
         
         logger.debug(f"Cache cleanup: removed {len(oldest_keys)} old entries")
     
     def clear(self) -> None:
         """Clear all cache entries"""
-        with self._lock:
-            self._cache.clear()
-            logger.debug("Cache cleared")
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+        logger.debug("Cache cleared")
     
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
+        total_count = 0
+        expired_count = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                total_count += len(shard)
+                expired_count += sum(
+                    1 for cached_user in shard.values()
+                    if cached_user.is_expired()
+                )
+        return {
+            "total_entries": total_count,
+            "expired_entries": expired_count,
+            "active_entries": total_count - expired_count,
+            "ttl_minutes": self.ttl_minutes,
+            "max_size": self.max_size
+        }
+
+class LookupCache:
+    """Thread-safe TTL cache for NSP lookup tables (priorities, statuses, groups, sources, forms, entity types)"""
+    
+    def __init__(self, ttl_minutes: int = 60):
+        self._cache: Dict[str, tuple] = {}  # name -> (time.monotonic() deadline, ids, default ID)
+        self._lock = threading.RLock()
+        self.ttl_minutes = ttl_minutes
+    
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get lookup table from cache if exists and not expired"""
         with self._lock:
-            now = datetime.now(timezone.utc)
-            expired_count = sum(
-                1 for cached_user in self._cache.values() 
-                if cached_user.is_expired(self.ttl_minutes)
-            )
-            return {
-                "total_entries": len(self._cache),
-                "expired_entries": expired_count,
-                "active_entries": len(self._cache) - expired_count,
-                "ttl_minutes": self.ttl_minutes,
-                "max_size": self.max_size
-            }
+            entry = self._cache.get(name)
+            if entry is not None:
+                if time.monotonic() < entry[0]:
+                    return entry[1]
+                del self._cache[name]
+            return None
+    
+    def get_default(self, name: str) -> Optional[int]:
+        """Get the default ID precomputed for a cached lookup table, if cached and not expired"""
+        with self._lock:
+            entry = self._cache.get(name)
+            if entry is not None and time.monotonic() < entry[0]:
+                return entry[2]
+            return None
+    
+    def put(self, name: str, ids: Dict[str, Any], default_id: Optional[int] = None) -> None:
+        """Store lookup table (and the default ID to use from it) in cache"""
+        with self._lock:
+            self._cache[name] = (time.monotonic() + self.ttl_minutes * 60, ids, default_id)
+    
+    def invalidate(self, name: str) -> None:
+        """Drop one cached lookup table, if present"""
+        with self._lock:
+            self._cache.pop(name, None)
+    
+    def clear(self) -> None:
+        """Clear all cached lookup tables"""
+        with self._lock:
+            self._cache.clear()
+
+class _PendingLookup:
+    """An in-flight user lookup that concurrent callers for the same email can wait on"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
 
 @dataclass
 class AuthToken:
@@ -166,9 +357,27 @@ class NSPClient:
         self.password = password
         self.auth_token = AuthToken()
         self.session = requests.Session()
+        self._url_cache: Dict[str, str] = {}
+        
+        # Size the keep-alive pool so concurrent Flask request threads reuse connections
+        # to NSP instead of opening (and discarding) new ones
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=20)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         
         # Initialize user cache
         self.user_cache = UserCache(ttl_minutes=30, max_size=100)
+        # Email -> ID rows from the narrow lookup used internally by the ticket queries
+        self.user_id_cache = UserCache(ttl_minutes=30, max_size=100)
+        # Remember emails that didn't match any user for a short while, so typos don't hit NSP repeatedly
+        self.user_not_found_cache = UserCache(ttl_minutes=1, max_size=256)
+        # User lookups currently being fetched from NSP, keyed by (lookup kind, lowercased email)
+        self._user_lookups_in_flight: Dict[Tuple[str, str], _PendingLookup] = {}
+        self._user_lookup_lock = threading.Lock()
+        # Lookup tables are essentially static configuration, so cache them for longer
+        self.lookup_cache = LookupCache(ttl_minutes=60)
+        # Long-lived worker threads for concurrent lookup fetches (avoids spawning threads per ticket)
+        self._lookup_executor = ThreadPoolExecutor(max_workers=5, thread_name_prefix='nsp-lookup')
         self.session.headers.update({
             'Content-Type': 'application/json',
             'Accept': 'application/json',
@@ -197,16 +406,22 @@ class NSPClient:
             response = self.session.get(auth_url, params=params)
             
             if response.status_code == 200:
-                data = response.json()
-                if 'Result' in data:
-                    token_data = data['Result']
-                    self.auth_token.token = token_data.get('Token', '')
-                    self.auth_token.expires = token_data.get('Expires', '')
+                data = _decode_json(response)
+                token_data = data.get('Result') or {}
+                token = token_data.get('Token')
+                # A missing Expires is tolerated, as before; the token then counts as expired and is refreshed on next use
+                expires = token_data.get('Expires', '')
+                
+                if token:
+                    # Swap in a new token object in one assignment, so concurrent readers keep
+                    # using the old token until the new one is complete
+                    self.auth_token = AuthToken(token=token, expires=expires)
                     
                     # Set Authorization header for future requests
-                    self.session.headers.update({
-                        'Authorization': f'Bearer {self.auth_token.token}'
-                    })
+                    self.session.headers['Authorization'] = f'Bearer {token}'
+                    
+                    # A new login may see different entity types, so drop the cached ones
+                    self.lookup_cache.invalidate('entity_types')
                     
                     logger.info(f"Authentication successful. Token expires: {self.auth_token.expires}")
                     return True
@@ -221,61 +436,69 @@ class NSPClient:
             logger.error(f"Error during authentication: {str(e)}")
             return False
     
-    def ensure_valid_token(self) -> bool:
-        """Ensure we have a valid token, re-authenticate if needed"""
+    def ensure_valid_token(self, force_new: bool = False) -> bool:
+        """Ensure we have a valid token, re-authenticate if needed (or always, with force_new)"""
+        if force_new:
+            # The current token stays in use until authentication succeeds
+            return self.authenticate()
         if not self.auth_token.token or self.auth_token.is_expired():
             logger.info("Token expired or missing, re-authenticating...")
             return self.authenticate()
         return True
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10),
+           retry=retry_if_exception(_is_transient_error), reraise=True)
+    def _do_http(self, method: str, url: str, data: Optional[Dict] = None) -> requests.Response:
+        """Perform a single HTTP call to NSP, retrying only transient failures (connection errors, timeouts, 5xx)"""
+        # Common headers and the Authorization token live on the session (see __init__/authenticate)
+        if method.upper() == 'GET':
+            response = self.session.get(url, params=data)
+        else:
+            # Serialize the body ourselves with orjson instead of requests' stdlib json
+            body = orjson.dumps(data) if data is not None else None
+            response = self.session.post(url, data=body)
+        
+        # Server errors are raised here so tenacity can retry them; everything else
+        # (including 401) is handed back to the caller untouched
+        if response.status_code >= 500:
+            response.raise_for_status()
+        return response
+    
     def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
         """Make HTTP request to NSP API with automatic token refresh and retry logic"""
         # Ensure we have a valid token before making request
         if not self.ensure_valid_token():
             raise Exception("Failed to obtain valid authentication token")
         
-        # Use PublicApi path for all endpoints except authentication
-        if endpoint.startswith('logon/'):
-            url = f"{self.base_url}/{endpoint}"
-        else:
-            url = f"{self.base_url}/PublicApi/{endpoint}"
+        # Use PublicApi path for all endpoints except authentication (URLs are built once per endpoint)
+        url = self._url_cache.get(endpoint)
+        if url is None:
+            if endpoint.startswith('logon/'):
+                url = f"{self.base_url}/{endpoint}"
+            else:
+                url = f"{self.base_url}/PublicApi/{endpoint}"
+            self._url_cache[endpoint] = url
         
         try:
-            # Set headers for this specific request
-            headers = {
-                'Content-Type': 'application/json',
-                'Accept': 'application/json',
-                'User-Agent': 'NSP-MCP-Connector/1.0',
-                'Cache-Control': 'no-cache',
-                'LanguageId': '1',  # English
-                'CultureName': 'en-US'
-            }
+            response = self._do_http(method, url, data)
             
-            # Add authorization header if we have a token
-            if self.auth_token.token:
-                headers['Authorization'] = f'Bearer {self.auth_token.token}'
-            
-            if method.upper() == 'GET':
-                response = self.session.get(url, params=data, headers=headers)
-            else:
-                response = self.session.post(url, json=data, headers=headers)
-            
-            # Handle 401 Unauthorized - token might have expired
+            # Handle 401 Unauthorized - token might have expired. Re-authenticate once and
+            # retry immediately, outside the retry/backoff layer
             if response.status_code == 401:
                 logger.warning("Received 401 Unauthorized, token may have expired. Re-authenticating...")
-                if self.authenticate():
-                    # Retry the request with new token
-                    headers['Authorization'] = f'Bearer {self.auth_token.token}'
-                    if method.upper() == 'GET':
-                        response = self.session.get(url, params=data, headers=headers)
-                    else:
-                        response = self.session.post(url, json=data, headers=headers)
-                else:
+                if not self.authenticate():
                     raise Exception("Failed to re-authenticate after 401 error")
+                response = self._do_http(method, url, data)
             
             response.raise_for_status()
-            return response.json()
+            try:
+                return _decode_json(response)
+            except orjson.JSONDecodeError:
+                # A 2xx body that isn't JSON (e.g. an HTML error page); log it like a failed request
+                logger.error("HTTP request failed: invalid JSON in response from %s", endpoint)
+                logger.error("Response status: %s", response.status_code)
+                logger.error("Response text: %s", response.text[:512])
+                raise
             
         except requests.exceptions.RequestException as e:
             logger.error(f"HTTP request failed: {str(e)}")
@@ -285,7 +508,7 @@ class NSPClient:
                 
                 # Try to parse JSON response to check for Errors field
                 try:
-                    json_response = e.response.json()
+                    json_response = _decode_json(e.response)
                     if 'Errors' in json_response:
                         errors = json_response['Errors']
                         # Handle case where Errors is an integer instead of a list
@@ -307,7 +530,8 @@ class NSPClient:
     
     def get_it_tickets(self, page: int = 1, page_size: int = 15, filters: Optional[Dict] = None, 
                       sort_by: str = "CreatedDate", sort_direction: str = "desc", 
-                      ticket_types: Optional[List[str]] = None) -> Dict[str, Any]:
+                      ticket_types: Optional[List[str]] = None,
+                      projection: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Get IT-related tickets using SysTicket entity type with filtering for IT ticket types.
         
@@ -319,36 +543,30 @@ class NSPClient:
             sort_direction: Sort direction ('asc' or 'desc')
             ticket_types: List of specific ticket types to include. If None, includes all IT types:
                          ['IT Request', 'ServiceOrderRequest', 'Incident Management']
+            projection: Optional list of columns to return (e.g. ['BaseHeader', 'BaseEntityStatus']).
+                        If None, all SysTicket columns are returned
         """
-        # Default IT ticket types if none specified
+        all_filters = []
         if ticket_types is None:
-            ticket_types = ['IT Request', 'ServiceOrderRequest', 'Incident Management']
-        
-        # Map ticket type names to their numeric IDs
-        ticket_type_ids = {
-            'IT Request': 112,
-            'ServiceOrderRequest': 113,
-            'Incident Management': 281
-        }
-        
-        # Build the type filter for IT-related tickets using numeric IDs
-        type_filters = []
-        for ticket_type in ticket_types:
-            if ticket_type in ticket_type_ids:
-                type_filters.append({
-                    "field": "Type",
-                    "operator": "eq",
-                    "value": ticket_type_ids[ticket_type]
+            # Default to all IT ticket types using the prebuilt filter
+            all_filters.append(copy.copy(_DEFAULT_TYPE_FILTER))
+        else:
+            # Build the type filter for the requested ticket types using numeric IDs
+            type_filters = []
+            for ticket_type in ticket_types:
+                if ticket_type in _IT_TICKET_TYPE_IDS:
+                    type_filters.append({
+                        "field": "Type",
+                        "operator": "eq",
+                        "value": _IT_TICKET_TYPE_IDS[ticket_type]
+                    })
+            
+            if type_filters:
+                all_filters.append({
+                    "logic": "or",
+                    "filters": type_filters
                 })
         
-        # Start with type filter
-        all_filters = []
-        if type_filters:
-            all_filters.append({
-                "logic": "or",
-                "filters": type_filters
-            })
-        
         # Add additional filters if provided
         if filters:
             # Convert simple key-value filters to NSP format
@@ -403,23 +621,9 @@ class NSPClient:
         if combined_filters:
             query_data["filters"] = combined_filters
         
-        # Workaround: Use explicit columns for SysTicket to avoid SortOrder issues
-        query_data["columns"] = [
-            "Type", "Owner", "Version", "CreatedDate", "CreatedBy", "UpdatedDate", "UpdatedBy", 
-            "IPAddress", "BaseStatus", "OwnerAgent", "CC", "Priority", "Category", "Callback", 
-            "CloseDateTime", "AgentGroup", "EndUserRating", "IsMajor", "BaseEntitySource", 
-            "GeoLocation", "BrowserName", "ReferenceNo", "BaseEntityStage", "Escalation", 
-            "Resolution", "BaseEntitySecurity", "IsSecurity", "FormId", "CaseType", "ReportedBy", 
-            "OnBehalfOf", "BaseEndUser", "BaseAgent", "BaseHeader", "BaseDescription", 
-            "BaseEntityStatus", "Location", "Customer", "SspFormId", "RequesterCommentCount", 
-            "EndUserCommentCount", "SlaSummary", "MainWaypoint", "Urgency", "Impact", "AssignedDate", 
-            "Address", "CommentCount", "LastCommentUserType", "ServiceEntitiesCount", "CiCount", 
-            "TaskCount", "TicketOrganization", "ScenarioName", "EntitySerialNumber", "ConversationId", 
-            "ServiceOrderItemId", "MasterTicket", "DependentParent", "IsInvoiceable", "IsInvoicingDecisionMade", 
-            "ServiceCiId", "ServiceCiCategoryId", "SlaStartTimeCounter", "JiraIssueKey", "MetaDataOrderInfoId", 
-            "StartMeetingTime", "EndMeetingTime", "RecipientAs", "AttachmentCount", "CiId", "CrmReference", 
-            "MarkedForDelete", "EmailOrigin", "IsClosedFromSsp"
-        ]
+        # Workaround: Use explicit columns for SysTicket to avoid SortOrder issues.
+        # A projection narrows the columns so NSP only returns (and we only parse) what the caller needs
+        query_data["columns"] = list(projection) if projection else _TICKET_COLUMNS
         
         # Add explicit sorting using the correct NSP API format
         query_data["sorts"] = [{"field": sort_by, "direction": sort_direction}]
@@ -498,15 +702,8 @@ class NSPClient:
             ticket_types: List of specific ticket types to include. If None, includes all IT types
         """
         # Build status filter based on BaseEntityStatus using the new filter structure
-        if status.lower() == "open":
-            status_filter = {
-                "BaseEntityStatus": [1, 3, 6, 9]  # Not closed statuses
-            }
-        elif status.lower() == "closed":
-            status_filter = {
-                "BaseEntityStatus": [10, 11]  # Resolved, Closed
-            }
-        else:
+        status_filter = _STATUS_FILTERS.get(status.lower())
+        if status_filter is None:
             raise ValueError(f"Invalid status: {status}. Must be 'open' or 'closed'")
         
         # Get IT tickets with status filter and ticket type filtering
@@ -627,7 +824,15 @@ class NSPClient:
     
     def get_entity_types(self) -> Dict[str, Any]:
         """Get available entity types"""
-        return self._make_request('GET', 'GetAllEntityTypes')
+        # Entity types are static configuration, so cache them with the lookup tables.
+        # Callers get a shallow copy so they can't change the cached dict
+        cached = self.lookup_cache.get('entity_types')
+        if cached is not None:
+            return copy.copy(cached)
+        
+        entity_types = self._make_request('GET', 'GetAllEntityTypes')
+        self.lookup_cache.put('entity_types', entity_types)
+        return copy.copy(entity_types)
     
     def get_entity_metadata(self, entity_type: str) -> Dict[str, Any]:
         """Get metadata for specific entity type"""
@@ -667,6 +872,8 @@ class NSPClient:
     def clear_user_cache(self) -> None:
         """Clear the user cache"""
         self.user_cache.clear()
+        self.user_id_cache.clear()
+        self.user_not_found_cache.clear()
         logger.info("User cache cleared")
     
     def warm_user_cache(self, emails: List[str]) -> Dict[str, bool]:
@@ -696,66 +903,95 @@ class NSPClient:
         if cached_user is not None:
             user_id = cached_user.get('Id', 'Unknown')
             user_name = cached_user.get('FullName', 'Unknown')
-            logger.info(f"Returning cached user data for: {email} -> {user_name} (ID: {user_id})")
+            logger.info("Returning cached user data for: %s -> %s (ID: %s)", email, user_name, user_id)
             return cached_user
         
-        # Cache miss - fetch from NSP API
-        logger.info(f"Cache miss - fetching user from NSP API: {email}")
+        if self.user_not_found_cache.get(email) is not None:
+            logger.info("Returning cached not-found result for: %s", email)
+            return None
         
-        query_data = {
-            "EntityType": "Person",
-            "columns": [
-                "Type", "Owner", "Version", "CreatedDate", "CreatedBy", "UpdatedDate", "UpdatedBy", 
-                "IPAddress", "BaseStatus", "LastLoginTime", "UserTypeId", "Email", "PasswordMD5HexHash", 
-                "LastPwdDate", "IsActive", "IsLicensed", "DisplayName", "AuthToken", "AuthTokenGeneratedOn", 
-                "WindowsUserName", "WindowsSidString", "LdapServerId", "Room", "CostCenter", "IsVIP", 
-                "VIPNotes", "FirstName", "LastName", "EMailAddress", "Phone", "MobilePhone", "Address", 
-                "Department", "JobTitle", "PersonTitle", "DateOfBirth", "Image", "FullName", "Organization", 
-                "SysLanguage", "MaxStorage", "Description", "Comment", "Notes", "Company", "FaxNumber", 
-                "HomeFolder", "HomeDrive", "HomePhone", "HomeAddress", "IpPhoneNumber", "Manager", 
-                "PagerNumber", "WebPageAddress", "LyncAddress", "PhoneClean", "MobilePhoneClean", 
-                "SkypeName", "MemberOf", "RoomNumber", "OfficeLocation", "ExtraCustomField1", 
-                "ExtraCustomField2", "ExtraCustomField3", "DoNotSendEmailNotification", "LyncTel", 
-                "AdManagerUserId", "SwedishPersonalNumber", "NormalizedSwedishPersonalNumber", 
-                "NorwegianPid", "ExternalId", "DoNotSendApprovalNotification", "u_Rrelsegrenkostnadsstlle", 
-                "u_Mailnotifieringvidnyttrende"
-            ],
-            "filters": {
-                "logic": "or",
-                "filters": [
-                    {
-                        "field": "Email",
-                        "operator": "eq",
-                        "value": email
-                    }
-                ]
-            },
-            "Page": 1,
-            "PageSize": 10
+        # Cache miss - fetch the full user record (shared with concurrent callers for the same email)
+        return self._coalesced_user_lookup(
+            ('user', email.lower()), lambda: self._fetch_user(email, _USER_QUERY_TEMPLATE, self.user_cache))
+    
+    def _coalesced_user_lookup(self, key: Tuple[str, str], fetch) -> Optional[Dict[str, Any]]:
+        """Run fetch() once for concurrent callers with the same key; the others wait for its result"""
+        with self._user_lookup_lock:
+            pending = self._user_lookups_in_flight.get(key)
+            is_leader = pending is None
+            if is_leader:
+                pending = _PendingLookup()
+                self._user_lookups_in_flight[key] = pending
+        
+        if not is_leader:
+            logger.info("Waiting for in-flight lookup of user: %s", key[1])
+            if pending.done.wait(timeout=_USER_LOOKUP_WAIT_SECONDS):
+                return pending.result
+            # Don't let one hung NSP call block every request for this user; look it up ourselves
+            logger.warning("In-flight lookup of user %s still running after %ss, fetching independently",
+                           key[1], _USER_LOOKUP_WAIT_SECONDS)
+            return fetch()
+        
+        try:
+            pending.result = fetch()
+            return pending.result
+        finally:
+            with self._user_lookup_lock:
+                del self._user_lookups_in_flight[key]
+            pending.done.set()
+    
+    def _fetch_user(self, email: str, query_template: Dict[str, Any], cache: UserCache) -> Optional[Dict[str, Any]]:
+        """Look up a user by email in NSP with the given column set and cache the result"""
+        # Cache miss - fetch from NSP API
+        logger.info("Cache miss - fetching user from NSP API: %s", email)
+        
+        # Only the email filter varies per lookup; the rest of the query is a shared template
+        query_data = copy.copy(query_template)
+        query_data["filters"] = {
+            "logic": "or",
+            "filters": [
+                {
+                    "field": "Email",
+                    "operator": "eq",
+                    "value": email
+                }
+            ]
         }
         
         try:
             result = self._make_request('POST', 'GetEntityListByQuery', query_data)
             users = result.get('Data', [])  # GetEntityListByQuery returns data in 'Data' field
             
-            # Find exact email match
-            for user in users:
-                if user.get('Email', '').lower() == email.lower():
-                    # Store in cache before returning
-                    self.user_cache.put(email, user)
-                    user_id = user.get('Id', 'Unknown')
-                    user_name = user.get('FullName', 'Unknown')
-                    logger.info(f"User found and cached: {email} -> {user_name} (ID: {user_id})")
-                    return user
+            # Check the one returned row really is this user, in case NSP ignored the filter
+            user = users[0] if users else None
+            if user is not None and (user.get('Email') or '').lower() == email.lower():
+                # Store in cache before returning
+                cache.put(email, user)
+                user_id = user.get('Id', 'Unknown')
+                user_name = user.get('FullName', 'Unknown')
+                logger.info("User found and cached: %s -> %s (ID: %s)", email, user_name, user_id)
+                return user
             
             # No user found - cache the null result temporarily (shorter TTL)
-            logger.info(f"User not found: {email}")
+            self.user_not_found_cache.put(email, {})
+            logger.info("User not found: %s", email)
             return None
             
         except Exception as e:
-            logger.error(f"Error looking up user by email {email}: {str(e)}")
+            logger.error("Error looking up user by email %s: %s", email, e)
             return None
     
+    def _get_user_id(self, user_email: str) -> Any:
+        """Get the NSP user ID for an email, using the narrow ID-only lookup on a cache miss"""
+        user = self.user_cache.get(user_email) or self.user_id_cache.get(user_email)
+        if user is None and self.user_not_found_cache.get(user_email) is None:
+            user = self._coalesced_user_lookup(
+                ('id', user_email.lower()),
+                lambda: self._fetch_user(user_email, _USER_ID_QUERY_TEMPLATE, self.user_id_cache))
+        if not user:
+            raise Exception(f"User not found: {user_email}")
+        return user.get('Id')
+    
     def get_tickets_by_user_role(self, user_email: str, role: str = "customer", page: int = 1, page_size: int = 15,
                                sort_by: str = "CreatedDate", sort_direction: str = "desc", 
                                ticket_types: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -771,21 +1007,17 @@ class NSPClient:
             sort_direction: Sort direction ('asc' or 'desc')
             ticket_types: List of specific ticket types to include. If None, includes all IT types
         """
-        # First get user information
-        user = self.get_user_by_email(user_email)
-        if not user:
-            raise Exception(f"User not found: {user_email}")
-        
-        user_id = user.get('Id')
+        user_id = self._get_user_id(user_email)
         
         # Create simple filters that get_it_tickets can handle
         # The get_it_tickets method will handle the complex filter structure internally
         filters = {}
         
-        if role.lower() == "customer":
+        role_lower = role.lower()
+        if role_lower == "customer":
             # Tickets where user is the end user/customer
             filters["BaseEndUser"] = user_id
-        elif role.lower() == "agent":
+        elif role_lower == "agent":
             # Tickets where user is the assigned agent
             filters["BaseAgent"] = user_id
         else:
@@ -811,18 +1043,14 @@ class NSPClient:
             sort_by: Field to sort by
             sort_direction: Sort direction ('asc' or 'desc')
         """
-        # First get user information
-        user = self.get_user_by_email(user_email)
-        if not user:
-            raise Exception(f"User not found: {user_email}")
-        
-        user_id = user.get('Id')
+        user_id = self._get_user_id(user_email)
         
         # Create role-based filters
         filters = {}
-        if role.lower() == "customer":
+        role_lower = role.lower()
+        if role_lower == "customer":
             filters["BaseEndUser"] = user_id
-        elif role.lower() == "agent":
+        elif role_lower == "agent":
             filters["BaseAgent"] = user_id
         else:
             raise ValueError(f"Invalid role: {role}. Must be 'customer' or 'agent'")
@@ -866,18 +1094,14 @@ class NSPClient:
             sort_by: Field to sort by
             sort_direction: Sort direction ('asc' or 'desc')
         """
-        # First get user information
-        user = self.get_user_by_email(user_email)
-        if not user:
-            raise Exception(f"User not found: {user_email}")
-        
-        user_id = user.get('Id')
+        user_id = self._get_user_id(user_email)
         
         # Create role-based filters
         filters = {}
-        if role.lower() == "customer":
+        role_lower = role.lower()
+        if role_lower == "customer":
             filters["BaseEndUser"] = user_id
-        elif role.lower() == "agent":
+        elif role_lower == "agent":
             filters["BaseAgent"] = user_id
         else:
             raise ValueError(f"Invalid role: {role}. Must be 'customer' or 'agent'")
@@ -903,18 +1127,14 @@ class NSPClient:
             sort_by: Field to sort by
             sort_direction: Sort direction ('asc' or 'desc')
         """
-        # First get user information
-        user = self.get_user_by_email(user_email)
-        if not user:
-            raise Exception(f"User not found: {user_email}")
-        
-        user_id = user.get('Id')
+        user_id = self._get_user_id(user_email)
         
         # Create role-based filters
         filters = {}
-        if role.lower() == "customer":
+        role_lower = role.lower()
+        if role_lower == "customer":
             filters["BaseEndUser"] = user_id
-        elif role.lower() == "agent":
+        elif role_lower == "agent":
             filters["BaseAgent"] = user_id
         else:
             raise ValueError(f"Invalid role: {role}. Must be 'customer' or 'agent'")
@@ -950,8 +1170,26 @@ class NSPClient:
                                  sort_by=sort_by, sort_direction=sort_direction,
                                  ticket_types=ticket_types)
     
+    def _extract_id_map(self, rows: List[Dict[str, Any]], name_keys: Tuple[str, ...]) -> Dict[str, int]:
+        """Build a lowercased name -> Id map from lookup rows, using the first non-empty name field"""
+        ids = {}
+        for row in rows:
+            row_id = row.get('Id')
+            if row_id is None:
+                continue
+            for key in name_keys:
+                name = row.get(key)
+                if name:
+                    ids[name.lower()] = row_id
+                    break
+        return ids
+
     def get_priority_ids(self) -> Dict[str, int]:
         """Get available priority IDs from NSP API"""
+        cached_ids = self.lookup_cache.get('priorities')
+        if cached_ids is not None:
+            return cached_ids
+        
         try:
             # Query the SysPriority table to get available priorities
             query_data = {
@@ -963,37 +1201,26 @@ class NSPClient:
             result = self._make_request('POST', 'GetEntityListByQuery', query_data)
             
             if result and result.get('Data'):
-                priorities = {}
-                for priority in result['Data']:
-                    # Use DisplayNameId if available and not empty/null, otherwise fallback to StrongName
-                    display_name = priority.get('DisplayNameId')
-                    strong_name = priority.get('StrongName', '')
-                    
-                    # Choose the name to use - prefer DisplayNameId if it exists and is not empty/null
-                    if display_name and display_name.strip():  # Check if not None, empty, or just whitespace
-                        name = display_name.lower()
-                    elif strong_name and strong_name.strip():
-                        name = strong_name.lower()
-                    else:
-                        # Skip this entry if we don't have a valid name
-                        continue
-                    
-                    priority_id = priority.get('Id')
-                    if priority_id is not None and name:  # Only add if we have both ID and name
-                        priorities[name] = priority_id
+                priorities = self._extract_id_map(result['Data'], ('DisplayNameId', 'StrongName'))
                 
-                logger.info(f"Found priorities: {priorities}")
+                logger.info("Found priorities: %s", priorities)
+                self.lookup_cache.put('priorities', priorities)
+                self.lookup_cache.put('priority_aliases', _build_priority_aliases(priorities))
                 return priorities
             else:
                 logger.warning("Could not fetch priorities from NSP API, using defaults")
                 return {"medium": 2}  # Fallback to default
                 
         except Exception as e:
-            logger.error(f"Error fetching priorities: {str(e)}")
+            logger.error("Error fetching priorities: %s", e)
             return {"medium": 2}  # Fallback to default
 
     def get_entity_status_ids(self) -> Dict[str, int]:
         """Get available entity status IDs from NSP API"""
+        cached_ids = self.lookup_cache.get('statuses')
+        if cached_ids is not None:
+            return cached_ids
+        
         try:
             query_data = {
                 "EntityType": "SysEntityStatus",
@@ -1005,37 +1232,25 @@ class NSPClient:
             result = self._make_request('POST', 'GetEntityListByQuery', query_data)
             
             if result and result.get('Data'):
-                statuses = {}
-                for status in result['Data']:
-                    # Use DisplayNameId if available and not empty/null, otherwise fallback to StrongName
-                    display_name = status.get('DisplayNameId')
-                    strong_name = status.get('StrongName', '')
-                    
-                    # Choose the name to use - prefer DisplayNameId if it exists and is not empty/null
-                    if display_name and display_name.strip():  # Check if not None, empty, or just whitespace
-                        name = display_name.lower()
-                    elif strong_name and strong_name.strip():
-                        name = strong_name.lower()
-                    else:
-                        # Skip this entry if we don't have a valid name
-                        continue
-                    
-                    status_id = status.get('Id')
-                    if status_id is not None and name:  # Only add if we have both ID and name
-                        statuses[name] = status_id
+                statuses = self._extract_id_map(result['Data'], ('DisplayNameId', 'StrongName'))
                 
-                logger.info(f"Found entity statuses: {statuses}")
+                logger.info("Found entity statuses: %s", statuses)
+                self.lookup_cache.put('statuses', statuses, next(iter(statuses.values()), 1))
                 return statuses
             else:
                 logger.warning("Could not fetch entity statuses from NSP API, using defaults")
                 return {"open": 1}  # Fallback to default
                 
         except Exception as e:
-            logger.error(f"Error fetching entity statuses: {str(e)}")
+            logger.error("Error fetching entity statuses: %s", e)
             return {"open": 1}  # Fallback to default
 
     def get_agent_group_ids(self) -> Dict[str, int]:
         """Get available agent group IDs from NSP API"""
+        cached_ids = self.lookup_cache.get('groups')
+        if cached_ids is not None:
+            return cached_ids
+        
         try:
             query_data = {
                 "EntityType": "SysGroup",
@@ -1047,37 +1262,25 @@ class NSPClient:
             result = self._make_request('POST', 'GetEntityListByQuery', query_data)
             
             if result and result.get('Data'):
-                groups = {}
-                for group in result['Data']:
-                    # Use GroupName if available and not empty/null, otherwise fallback to StrongName
-                    group_name = group.get('GroupName')
-                    strong_name = group.get('StrongName', '')
-                    
-                    # Choose the name to use - prefer GroupName if it exists and is not empty/null
-                    if group_name and group_name.strip():  # Check if not None, empty, or just whitespace
-                        name = group_name.lower()
-                    elif strong_name and strong_name.strip():
-                        name = strong_name.lower()
-                    else:
-                        # Skip this entry if we don't have a valid name
-                        continue
-                    
-                    group_id = group.get('Id')
-                    if group_id is not None and name:  # Only add if we have both ID and name
-                        groups[name] = group_id
+                groups = self._extract_id_map(result['Data'], ('GroupName', 'StrongName'))
                 
-                logger.info(f"Found agent groups: {groups}")
+                logger.info("Found agent groups: %s", groups)
+                self.lookup_cache.put('groups', groups, next(iter(groups.values()), 1))
                 return groups
             else:
                 logger.warning("Could not fetch agent groups from NSP API, using defaults")
                 return {"default": 1}  # Fallback to default
                 
         except Exception as e:
-            logger.error(f"Error fetching agent groups: {str(e)}")
+            logger.error("Error fetching agent groups: %s", e)
             return {"default": 1}  # Fallback to default
 
     def get_entity_source_ids(self) -> Dict[str, int]:
         """Get available entity source IDs from NSP API"""
+        cached_ids = self.lookup_cache.get('sources')
+        if cached_ids is not None:
+            return cached_ids
+        
         try:
             query_data = {
                 "EntityType": "SysEntitySource",
@@ -1089,37 +1292,25 @@ class NSPClient:
             result = self._make_request('POST', 'GetEntityListByQuery', query_data)
             
             if result and result.get('Data'):
-                sources = {}
-                for source in result['Data']:
-                    # Use DisplayNameId if available and not empty/null, otherwise fallback to SourceName
-                    display_name = source.get('DisplayNameId')
-                    source_name = source.get('SourceName', '')
-                    
-                    # Choose the name to use - prefer DisplayNameId if it exists and is not empty/null
-                    if display_name and display_name.strip():  # Check if not None, empty, or just whitespace
-                        name = display_name.lower()
-                    elif source_name and source_name.strip():
-                        name = source_name.lower()
-                    else:
-                        # Skip this entry if we don't have a valid name
-                        continue
-                    
-                    source_id = source.get('Id')
-                    if source_id is not None and name:  # Only add if we have both ID and name
-                        sources[name] = source_id
+                sources = self._extract_id_map(result['Data'], ('DisplayNameId', 'SourceName'))
                 
-                logger.info(f"Found entity sources: {sources}")
+                logger.info("Found entity sources: %s", sources)
+                self.lookup_cache.put('sources', sources, _default_source_id(sources))
                 return sources
             else:
                 logger.warning("Could not fetch entity sources from NSP API, using defaults")
                 return {"web": 1}  # Fallback to default
                 
         except Exception as e:
-            logger.error(f"Error fetching entity sources: {str(e)}")
+            logger.error("Error fetching entity sources: %s", e)
             return {"web": 1}  # Fallback to default
 
     def get_form_ids(self) -> Dict[str, int]:
         """Get available form IDs from NSP API"""
+        cached_ids = self.lookup_cache.get('forms')
+        if cached_ids is not None:
+            return cached_ids
+        
         try:
             query_data = {
                 "EntityType": "SysEntityForm",
@@ -1131,50 +1322,87 @@ class NSPClient:
             result = self._make_request('POST', 'GetEntityListByQuery', query_data)
             
             if result and result.get('Data'):
-                forms = {}
-                for form in result['Data']:
-                    # Use DisplayName if available and not empty/null, otherwise fallback to StrongName
-                    display_name = form.get('DisplayName')
-                    strong_name = form.get('StrongName', '')
-                    
-                    # Choose the name to use - prefer DisplayName if it exists and is not empty/null
-                    if display_name and display_name.strip():  # Check if not None, empty, or just whitespace
-                        name = display_name.lower()
-                    elif strong_name and strong_name.strip():
-                        name = strong_name.lower()
-                    else:
-                        # Skip this entry if we don't have a valid name
-                        continue
-                    
-                    form_id = form.get('Id')
-                    if form_id is not None and name:  # Only add if we have both ID and name
-                        forms[name] = form_id
+                forms = self._extract_id_map(result['Data'], ('DisplayName', 'StrongName'))
                 
-                logger.info(f"Found forms: {forms}")
+                logger.info("Found forms: %s", forms)
+                self.lookup_cache.put('forms', forms, next(iter(forms.values()), 1))
                 return forms
             else:
                 logger.warning("Could not fetch forms from NSP API, using defaults")
                 return {"default": 1}  # Fallback to default
                 
         except Exception as e:
-            logger.error(f"Error fetching forms: {str(e)}")
+            logger.error("Error fetching forms: %s", e)
             return {"default": 1}  # Fallback to default
 
+    def _fetch_lookups(self, fetchers: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
+        """Run the given lookup-table fetchers, concurrently for any tables that aren't cached yet"""
+        results = {}
+        to_fetch = {}
+        for name, fetch in fetchers.items():
+            cached_ids = self.lookup_cache.get(name)
+            if cached_ids is not None:
+                results[name] = cached_ids
+            else:
+                to_fetch[name] = fetch
+        
+        if len(to_fetch) == 1:
+            name, fetch = to_fetch.popitem()
+            results[name] = fetch()
+        elif to_fetch:
+            # The lookups are independent, so fetch them concurrently (after making sure the token
+            # is valid, so the workers don't all re-authenticate)
+            self.ensure_valid_token()
+            futures = {name: self._lookup_executor.submit(fetch) for name, fetch in to_fetch.items()}
+            for name, future in futures.items():
+                results[name] = future.result()
+        return results
+    
+    def warm_lookup_caches(self) -> None:
+        """Pre-fetch all lookup tables so the first ticket creation doesn't pay for them"""
+        self._fetch_lookups({
+            'priorities': self.get_priority_ids,
+            'statuses': self.get_entity_status_ids,
+            'groups': self.get_agent_group_ids,
+            'sources': self.get_entity_source_ids,
+            'forms': self.get_form_ids
+        })
+        logger.info("Lookup caches warmed")
+    
+    def start_lookup_cache_warming(self) -> threading.Thread:
+        """Warm the lookup caches in a background thread"""
+        thread = threading.Thread(target=self.warm_lookup_caches, name='nsp-lookup-warming', daemon=True)
+        thread.start()
+        return thread
+    
+    def _lookup_default(self, name: str, ids: Dict[str, int]) -> int:
+        """Get the default ID for a lookup table (precomputed when the table was cached)"""
+        default_id = self.lookup_cache.get_default(name)
+        if default_id is None:
+            # Table came from a fallback rather than the cache - pick the default now
+            default_id = _default_source_id(ids) if name == 'sources' else next(iter(ids.values()), 1)
+        return default_id
+    
     def create_ticket_with_user_context(self, ticket_data: Dict[str, Any], user_email: str, role: str = "customer") -> Dict[str, Any]:
         """Create ticket with proper user context based on role"""
-        # Get user information
-        user = self.get_user_by_email(user_email)
-        if not user:
-            raise Exception(f"User not found: {user_email}")
-        
-        user_id = user.get('Id')
-        
-        # Get available IDs from NSP for required fields
-        priority_ids = self.get_priority_ids()
-        status_ids = self.get_entity_status_ids()
-        agent_group_ids = self.get_agent_group_ids()
-        source_ids = self.get_entity_source_ids()
-        form_ids = self.get_form_ids()
+        user_id = self._get_user_id(user_email)
+        
+        # Get available IDs from NSP, but only for the tables this ticket needs: priorities when a
+        # priority is given, and the default-value tables for required fields the caller didn't set
+        lookup_fetchers = {}
+        if 'priority' in ticket_data:
+            lookup_fetchers['priorities'] = self.get_priority_ids
+        if 'BaseEntityStatusId' not in ticket_data:
+            lookup_fetchers['statuses'] = self.get_entity_status_ids
+        if 'AgentGroupId' not in ticket_data:
+            lookup_fetchers['groups'] = self.get_agent_group_ids
+        if 'BaseEntitySource' not in ticket_data:
+            lookup_fetchers['sources'] = self.get_entity_source_ids
+        if 'FormId' not in ticket_data:
+            lookup_fetchers['forms'] = self.get_form_ids
+        lookup_ids = self._fetch_lookups(lookup_fetchers)
+        priority_ids = lookup_ids.get('priorities', {})
+        priority_aliases = self.lookup_cache.get('priority_aliases') or {}
         
         # Convert field names from Azure Function format to NSP format
         converted_data = {}
@@ -1188,6 +1416,9 @@ class NSPClient:
                 priority_lower = value.lower() if isinstance(value, str) else str(value).lower()
                 if priority_lower in priority_ids:
                     converted_data["PriorityId"] = priority_ids[priority_lower]
+                elif priority_lower in priority_aliases:
+                    # Word or short form of a priority name, e.g. "high" for "2 - high" or "med"
+                    converted_data["PriorityId"] = priority_aliases[priority_lower]
                 else:
                     # Try to find a close match
                     for name, pid in priority_ids.items():
@@ -1198,7 +1429,7 @@ class NSPClient:
                         # Use first available priority as fallback
                         first_priority = next(iter(priority_ids.values()), 2)
                         converted_data["PriorityId"] = first_priority
-                        logger.warning(f"Priority '{value}' not found, using fallback ID: {first_priority}")
+                        logger.warning("Priority '%s' not found, using fallback ID: %s", value, first_priority)
             elif key == "category":
                 # For now, skip category as it might need special handling
                 pass
@@ -1206,58 +1437,41 @@ class NSPClient:
                 # Keep other fields as-is
                 converted_data[key] = value
         
-        # Get valid IDs for required fields
-        default_status_id = next(iter(status_ids.values()), 1)
-        default_agent_group_id = next(iter(agent_group_ids.values()), 1)
-        
-        # Use Microsoft Chat Bot as source since we're creating tickets via AI assistant
-        default_source_id = source_ids.get('microsoft chat bot', 16)  # ID 16 for Microsoft Chat Bot
-        if not default_source_id:
-            # Fallback to API if Microsoft Chat Bot not found
-            default_source_id = source_ids.get('api', 24)  # ID 24 for API
-            if not default_source_id:
-                # Final fallback to first available source
-                default_source_id = next(iter(source_ids.values()), 1)
-        
-        default_form_id = next(iter(form_ids.values()), 1)
-        
-        # Prepare ticket data with required fields using valid IDs
-        prepared_ticket_data = {
-            "EntityType": "Ticket",  # Required by NSP API
-            "BaseEntityStatusId": default_status_id,
-            "AgentGroupId": default_agent_group_id,
-            "BaseEntitySource": default_source_id,
-            "FormId": default_form_id,
-            **converted_data
-        }
+        # Prepare ticket data with required fields using valid IDs (explicit values in the request win)
+        prepared_ticket_data = {"EntityType": "Ticket"}  # Required by NSP API
+        if 'statuses' in lookup_ids:
+            prepared_ticket_data["BaseEntityStatusId"] = self._lookup_default('statuses', lookup_ids['statuses'])
+        if 'groups' in lookup_ids:
+            prepared_ticket_data["AgentGroupId"] = self._lookup_default('groups', lookup_ids['groups'])
+        if 'sources' in lookup_ids:
+            prepared_ticket_data["BaseEntitySource"] = self._lookup_default('sources', lookup_ids['sources'])
+        if 'forms' in lookup_ids:
+            prepared_ticket_data["FormId"] = self._lookup_default('forms', lookup_ids['forms'])
+        prepared_ticket_data.update(converted_data)
         
         # Set user context based on role
-        if role.lower() == "customer":
+        role_lower = role.lower()
+        if role_lower == "customer":
             # User is creating ticket as customer
             prepared_ticket_data['BaseEndUser'] = user_id
             prepared_ticket_data['CreatedBy'] = user_id
             prepared_ticket_data['UpdatedBy'] = user_id
-            logger.info(f"Creating ticket as customer: {user_email}")
-        elif role.lower() == "agent":
+            logger.info("Creating ticket as customer: %s", user_email)
+        elif role_lower == "agent":
             # User is creating ticket as agent
             prepared_ticket_data['BaseAgent'] = user_id
             prepared_ticket_data['CreatedBy'] = user_id
             prepared_ticket_data['UpdatedBy'] = user_id
-            logger.info(f"Creating ticket as agent: {user_email}")
+            logger.info("Creating ticket as agent: %s", user_email)
         else:
             raise ValueError(f"Invalid role: {role}. Must be 'customer' or 'agent'")
         
-        logger.info(f"Final ticket data: {prepared_ticket_data}")
+        logger.info("Final ticket data: %s", prepared_ticket_data)
         return self._make_request('POST', 'SaveEntity', prepared_ticket_data)
     
     def update_ticket_with_user_context(self, ticket_id: int, updates: Dict[str, Any], user_email: str, role: str = "agent") -> Dict[str, Any]:
         """Update ticket with proper user context based on role"""
-        # Get user information
-        user = self.get_user_by_email(user_email)
-        if not user:
-            raise Exception(f"User not found: {user_email}")
-        
-        user_id = user.get('Id')
+        user_id = self._get_user_id(user_email)
         
         update_data = {
             "EntityType": "Ticket",
@@ -1266,12 +1480,13 @@ class NSPClient:
         }
         
         # Set user context based on role
-        if role.lower() == "agent":
+        role_lower = role.lower()
+        if role_lower == "agent":
             # Agent is updating the ticket
             update_data['ModifiedBy'] = user_id
             update_data['BaseAgent'] = user_id
             logger.info(f"Updating ticket {ticket_id} as agent: {user_email}")
-        elif role.lower() == "customer":
+        elif role_lower == "customer":
             # Customer is updating the ticket (e.g., adding comments)
             update_data['ModifiedBy'] = user_id
             logger.info(f"Updating ticket {ticket_id} as customer: {user_email}")
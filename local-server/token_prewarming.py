@@ -3,58 +3,101 @@ Smart Token Pre-warming for NSP MCP Connector
 Keeps NSP authentication token warm to eliminate timeout issues
 """
 
+import re
+import secrets
 import threading
+import time
 import logging
 import os
 from datetime import datetime, timezone, timedelta
-from typing import Optional
-from dataclasses import dataclass
+from typing import Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Pre-warming configuration, read once at import (app.py loads .env before importing this module)
+_DEFAULT_REFRESH_BUFFER_MINUTES = int(os.getenv('PREWARMING_REFRESH_BUFFER', '5'))
+# Fraction of the remaining token lifetime after which to refresh (1.0 = only the buffer applies)
+_DEFAULT_REFRESH_FRACTION = float(os.getenv('PREWARMING_REFRESH_FRACTION', '0.5'))
+
+# Refreshes are spread over +/- this many seconds so connectors sharing one NSP don't all
+# authenticate at the same instant
+_REFRESH_JITTER_SECONDS = 30
+
+# Failed refreshes are retried after 30s, 60s, 120s, ... capped at 10 minutes
+_RETRY_BASE_SECONDS = 30
+_RETRY_MAX_SECONDS = 600
+
+# NSP token expiry format (UTC), e.g. "2025-08-19T21:54:41.6073688Z"
+_EXPIRY_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,7}))?Z?$')
+
 class TokenSchedule:
     """Information about token refresh scheduling"""
-    expires_at: Optional[datetime] = None
-    refresh_at: Optional[datetime] = None
-    refresh_buffer_minutes: int = 5
-    next_refresh_timer: Optional[threading.Timer] = None
+    # Plain class with __slots__ (dataclass(slots=True) needs Python 3.10, the image runs 3.9)
+    __slots__ = ('expires_at', 'refresh_at', 'refresh_buffer_minutes')
+    
+    def __init__(self, expires_at: Optional[datetime] = None, refresh_at: Optional[datetime] = None,
+                 refresh_buffer_minutes: int = 5):
+        self.expires_at = expires_at
+        self.refresh_at = refresh_at
+        self.refresh_buffer_minutes = refresh_buffer_minutes
+    
+    def __repr__(self) -> str:
+        return (f"TokenSchedule(expires_at={self.expires_at!r}, refresh_at={self.refresh_at!r}, "
+                f"refresh_buffer_minutes={self.refresh_buffer_minutes!r})")
 
 class SmartTokenWarmer:
     """Intelligent token pre-warming system"""
     
-    def __init__(self, nsp_client):
+    def __init__(self, nsp_client, refresh_buffer_minutes: Optional[int] = None,
+                 refresh_fraction: Optional[float] = None):
         self.nsp_client = nsp_client
         self.running = False
         self.schedule = TokenSchedule()
-        self.refresh_buffer_minutes = int(os.getenv('PREWARMING_REFRESH_BUFFER', '5'))
+        if refresh_buffer_minutes is None:
+            refresh_buffer_minutes = _DEFAULT_REFRESH_BUFFER_MINUTES
+        if refresh_fraction is None:
+            refresh_fraction = _DEFAULT_REFRESH_FRACTION
+        self.refresh_buffer_minutes = refresh_buffer_minutes
+        self.refresh_fraction = min(max(refresh_fraction, 0.0), 1.0)
+        
+        # A single scheduler thread sleeps on this condition until the next refresh is due
+        self._cv = threading.Condition()
+        self._wake_deadline: Optional[float] = None  # time.monotonic() value
+        self._scheduler_generation = 0
+        self._force_pending = False  # A manual refresh was requested for the next wake-up
+        
+        # Serializes refreshes so concurrent triggers don't authenticate more than once
+        self._refresh_lock = threading.Lock()
+        
+        # Last parsed token expiry as (raw expiry string, parsed datetime)
+        self._expiry_cache: Optional[Tuple[str, datetime]] = None
+        
+        # Preformatted schedule times for get_status, rebuilt only when the schedule changes
+        self._schedule_status = {"expires_at": None, "refresh_at": None}
+        self._refresh_deadline: Optional[float] = None  # time.monotonic() value of the scheduled refresh
+        
+        # Consecutive failed refreshes, drives the retry backoff
+        self._retry_attempt = 0
         
-        logger.info(f"SmartTokenWarmer initialized with {self.refresh_buffer_minutes}min refresh buffer")
+        logger.info("SmartTokenWarmer initialized with %.0f%% lifetime refresh point and %dmin refresh buffer",
+                    self.refresh_fraction * 100, self.refresh_buffer_minutes)
     
     def parse_token_expiry(self, expires_str: str) -> Optional[datetime]:
         """Parse NSP token expiry string to datetime"""
         try:
-            # Handle NSP format: "2025-08-19T21:54:41.6073688Z"
-            if expires_str.endswith('Z'):
-                # Remove Z and handle potential microsecond precision issues
-                clean_str = expires_str.rstrip('Z')
-                
-                # NSP sometimes returns 7 digits for microseconds, Python expects max 6
-                if '.' in clean_str:
-                    date_part, microsec_part = clean_str.split('.')
-                    # Truncate microseconds to 6 digits if longer
-                    if len(microsec_part) > 6:
-                        microsec_part = microsec_part[:6]
-                    clean_str = f"{date_part}.{microsec_part}"
-                
-                # Add UTC timezone
-                clean_str += '+00:00'
-                return datetime.fromisoformat(clean_str)
+            # Handle NSP format: "2025-08-19T21:54:41.6073688Z" in a single regex match.
+            # NSP sometimes returns 7 digits for microseconds, Python expects max 6
+            match = _EXPIRY_RE.match(expires_str)
+            if match:
+                year, month, day, hour, minute, second, fraction = match.groups()
+                microsecond = int((fraction or '0')[:6].ljust(6, '0'))
+                return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second),
+                                microsecond, tzinfo=timezone.utc)
             
             # Fallback for other formats
             return datetime.fromisoformat(expires_str)
         except Exception as e:
-            logger.error(f"Failed to parse token expiry '{expires_str}': {e}")
+            logger.error("Failed to parse token expiry '%s': %s", expires_str, e)
             return None
     
     def get_current_token_expiry(self) -> Optional[datetime]:
@@ -62,20 +105,64 @@ class SmartTokenWarmer:
         try:
             token_info = self.nsp_client.get_token_info()
             if token_info['has_token'] and token_info['expires']:
-                return self.parse_token_expiry(token_info['expires'])
+                expires_str = token_info['expires']
+                # One-entry cache: the expiry string only changes when the token does
+                if self._expiry_cache and self._expiry_cache[0] == expires_str:
+                    return self._expiry_cache[1]
+                expiry_time = self.parse_token_expiry(expires_str)
+                if expiry_time:
+                    self._expiry_cache = (expires_str, expiry_time)
+                return expiry_time
         except Exception as e:
-            logger.error(f"Failed to get token expiry: {e}")
+            logger.error("Failed to get token expiry: %s", e)
         return None
     
     def calculate_refresh_time(self, expiry_time: datetime) -> datetime:
-        """Calculate when to refresh token (buffer minutes before expiry)"""
-        return expiry_time - timedelta(minutes=self.refresh_buffer_minutes)
+        """Calculate when to refresh token (at the lifetime fraction, no later than buffer minutes before expiry, with jitter)"""
+        now = datetime.now(timezone.utc)
+        # Refreshing part-way through the lifetime leaves room to retry if NSP auth is slow;
+        # the buffer still guarantees a minimum margin for short-lived tokens
+        refresh_time = min(now + (expiry_time - now) * self.refresh_fraction,
+                           expiry_time - timedelta(minutes=self.refresh_buffer_minutes))
+        jitter_seconds = secrets.randbelow(2 * _REFRESH_JITTER_SECONDS) - _REFRESH_JITTER_SECONDS
+        logger.debug("Applying %+d s jitter to token refresh time", jitter_seconds)
+        return refresh_time + timedelta(seconds=jitter_seconds)
+    
+    def _scheduler_loop(self, generation: int):
+        """Run scheduled refreshes until pre-warming is stopped (or a newer scheduler takes over)"""
+        while True:
+            with self._cv:
+                while self.running and generation == self._scheduler_generation:
+                    if self._wake_deadline is None:
+                        self._cv.wait()
+                        continue
+                    delay_seconds = self._wake_deadline - time.monotonic()
+                    if delay_seconds <= 0:
+                        break
+                    self._cv.wait(timeout=delay_seconds)
+                
+                if not self.running or generation != self._scheduler_generation:
+                    return
+                self._wake_deadline = None
+                force, self._force_pending = self._force_pending, False
+            
+            self.refresh_token(force=force)
+    
+    def _set_wake_deadline(self, deadline: Optional[float]):
+        """Set (or clear) the monotonic time at which the scheduler thread should next refresh the token"""
+        with self._cv:
+            # A pending forced refresh runs as soon as possible; a newly scheduled refresh can't postpone it
+            if self._force_pending and deadline is not None:
+                deadline = min(deadline, time.monotonic())
+            self._wake_deadline = deadline
+            self._cv.notify()
     
     def cancel_scheduled_refresh(self):
         """Cancel any currently scheduled refresh"""
-        if self.schedule.next_refresh_timer:
-            self.schedule.next_refresh_timer.cancel()
-            self.schedule.next_refresh_timer = None
+        had_scheduled_refresh = self._wake_deadline is not None
+        # Always notify, so a stopped warmer's scheduler thread wakes up and exits
+        self._set_wake_deadline(None)
+        if had_scheduled_refresh:
             logger.debug("Cancelled scheduled token refresh")
     
     def schedule_next_refresh(self) -> bool:
@@ -91,75 +178,102 @@ class SmartTokenWarmer:
         
         # Ensure refresh time is in the future
         if refresh_time <= now:
-            logger.warning(f"Token expires too soon ({expiry_time}), refreshing immediately")
-            threading.Thread(target=self.refresh_token, daemon=True).start()
-            return True
+            logger.warning("Token expires too soon (%s), refreshing immediately", expiry_time)
+            refresh_time = now
         
         delay_seconds = (refresh_time - now).total_seconds()
         
-        # Cancel any existing timer
-        self.cancel_scheduled_refresh()
+        # Schedule new refresh (replaces any pending one). Deadlines are monotonic, so wall-clock
+        # adjustments can't make the refresh fire early or late; the datetimes are kept for display
+        self._refresh_deadline = time.monotonic() + delay_seconds
+        self._set_wake_deadline(self._refresh_deadline)
         
-        # Schedule new refresh
-        self.schedule.next_refresh_timer = threading.Timer(delay_seconds, self.refresh_token)
-        self.schedule.next_refresh_timer.daemon = True
-        self.schedule.next_refresh_timer.start()
+        # A schedule based on a valid token ends any retry backoff
+        self._retry_attempt = 0
         
         # Update schedule info
         self.schedule.expires_at = expiry_time
         self.schedule.refresh_at = refresh_time
+        self._schedule_status = {
+            "expires_at": expiry_time.isoformat(),
+            "refresh_at": refresh_time.isoformat()
+        }
         
-        logger.info(f"🕒 Token refresh scheduled:")
-        logger.info(f"   Expires at: {expiry_time}")
-        logger.info(f"   Refresh at: {refresh_time} ({delay_seconds/60:.1f} minutes)")
+        # One lazily formatted record; nothing is formatted unless DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Token refresh scheduled:\n   Expires at: %s\n   Refresh at: %s (%.1f minutes)",
+                         expiry_time, refresh_time, delay_seconds / 60)
         
         return True
     
-    def refresh_token(self):
+    def _token_refreshed_by_peer(self, token_before: str, force: bool) -> bool:
+        """Check if another refresh already replaced the token while we waited for the refresh lock"""
+        expiry_time = self.get_current_token_expiry()
+        if not expiry_time:
+            return False
+        if expiry_time - datetime.now(timezone.utc) <= timedelta(minutes=self.refresh_buffer_minutes):
+            return False
+        # Token still has plenty of life. A forced refresh is only redundant if someone else got a
+        # new token after it was requested; a scheduled one if the token changed since it was scheduled
+        if force:
+            return self.nsp_client.auth_token.token != token_before
+        return expiry_time != self.schedule.expires_at
+    
+    def refresh_token(self, force: bool = False):
         """Refresh NSP token and schedule next refresh"""
         if not self.running:
             logger.debug("Token warmer stopped - skipping refresh")
             return
+        
+        token_before = self.nsp_client.auth_token.token
+        with self._refresh_lock:
+            if self._token_refreshed_by_peer(token_before, force):
+                logger.debug("Token already refreshed by peer - skipping authentication")
+                if not self.schedule_next_refresh():
+                    self._schedule_retry_refresh()
+                return
             
+            self._do_refresh()
+    
+    def _do_refresh(self):
+        """Authenticate with NSP for a fresh token (caller holds the refresh lock)"""
         try:
-            logger.info("🔥 Pre-warming: Refreshing NSP token...")
+            logger.debug("Pre-warming: refreshing NSP token")
             
-            # Force new authentication by clearing current token
-            old_token_info = self.nsp_client.get_token_info()
-            self.nsp_client.auth_token.token = ""
-            self.nsp_client.auth_token.expires = ""
-            
-            # Perform fresh authentication
-            success = self.nsp_client.ensure_valid_token()
+            # Fresh authentication; the current token keeps serving requests until it is replaced
+            success = self.nsp_client.ensure_valid_token(force_new=True)
             
             if success:
-                new_token_info = self.nsp_client.get_token_info()
-                logger.info("✅ Token successfully refreshed via pre-warming")
-                logger.info(f"   New token expires: {new_token_info['expires']}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Token successfully refreshed via pre-warming (new token expires %s)",
+                                self.nsp_client.get_token_info()['expires'])
                 
                 # Schedule next refresh based on new token
                 if not self.schedule_next_refresh():
                     logger.error("Failed to schedule next refresh after successful token refresh")
-                    self._schedule_retry_refresh(300)  # Retry in 5 minutes
+                    self._schedule_retry_refresh()
             else:
-                logger.error("❌ Token refresh failed - scheduling retry")
-                self._schedule_retry_refresh(300)  # Retry in 5 minutes
+                logger.error("Token refresh failed - scheduling retry")
+                self._schedule_retry_refresh()
                 
         except Exception as e:
-            logger.error(f"Token refresh error: {e}")
-            self._schedule_retry_refresh(300)  # Retry in 5 minutes
+            logger.error("Token refresh error: %s", e)
+            self._schedule_retry_refresh()
     
-    def _schedule_retry_refresh(self, delay_seconds: int):
-        """Schedule a retry refresh after failure"""
+    def _schedule_retry_refresh(self):
+        """Schedule a retry refresh after failure, backing off exponentially"""
         if not self.running:
             return
-            
-        self.cancel_scheduled_refresh()
-        self.schedule.next_refresh_timer = threading.Timer(delay_seconds, self.refresh_token)
-        self.schedule.next_refresh_timer.daemon = True
-        self.schedule.next_refresh_timer.start()
         
-        logger.info(f"🔄 Token refresh retry scheduled in {delay_seconds/60:.1f} minutes")
+        delay_seconds = min(_RETRY_MAX_SECONDS, _RETRY_BASE_SECONDS * 2 ** self._retry_attempt)
+        delay_seconds += secrets.randbelow(11) - 5
+        self._retry_attempt += 1
+        
+        self._set_wake_deadline(time.monotonic() + delay_seconds)
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Token refresh retry #%d scheduled in %.1f minutes",
+                        self._retry_attempt, delay_seconds / 60)
     
     def start_prewarming(self) -> bool:
         """Start intelligent token pre-warming"""
@@ -167,32 +281,43 @@ class SmartTokenWarmer:
             logger.warning("Token pre-warming already running")
             return True
             
-        logger.info("🚀 Starting intelligent token pre-warming...")
+        logger.info("Starting intelligent token pre-warming")
         self.running = True
         
+        # Start the scheduler thread (any thread left from a previous run exits on its own)
+        with self._cv:
+            self._scheduler_generation += 1
+            self._wake_deadline = None
+            self._force_pending = False
+            generation = self._scheduler_generation
+        threading.Thread(target=self._scheduler_loop, args=(generation,),
+                         name="token-prewarming", daemon=True).start()
+        
         # Check current token status
         token_info = self.nsp_client.get_token_info()
         
         if not token_info['has_token'] or token_info['is_expired']:
-            logger.info("No valid token found - performing initial authentication...")
+            logger.info("No valid token found - performing initial authentication")
             success = self.nsp_client.ensure_valid_token()
             
             if not success:
-                logger.error("❌ Failed to obtain initial token - pre-warming cannot start")
+                logger.error("Failed to obtain initial token - pre-warming cannot start")
                 self.running = False
+                self.cancel_scheduled_refresh()
                 return False
                 
-            logger.info("✅ Initial token obtained successfully")
+            logger.info("Initial token obtained successfully")
         else:
-            logger.info("✅ Valid token already exists")
+            logger.info("Valid token already exists")
         
         # Schedule first refresh
         if self.schedule_next_refresh():
-            logger.info("🔥 Token pre-warming system active")
+            logger.info("Token pre-warming system active")
             return True
         else:
-            logger.error("❌ Failed to schedule initial token refresh")
+            logger.error("Failed to schedule initial token refresh")
             self.running = False
+            self.cancel_scheduled_refresh()
             return False
     
     def stop_prewarming(self):
@@ -200,23 +325,24 @@ class SmartTokenWarmer:
         if not self.running:
             return
             
-        logger.info("🛑 Stopping token pre-warming...")
+        logger.info("Stopping token pre-warming")
         self.running = False
         self.cancel_scheduled_refresh()
         
         # Clear schedule info
         self.schedule = TokenSchedule()
+        self._schedule_status = {"expires_at": None, "refresh_at": None}
+        self._refresh_deadline = None
         
-        logger.info("✅ Token pre-warming stopped")
+        logger.info("Token pre-warming stopped")
     
     def get_status(self) -> dict:
         """Get current pre-warming status"""
         token_info = self.nsp_client.get_token_info()
-        now = datetime.now(timezone.utc)
-        
         status = {
             "prewarming_active": self.running,
             "refresh_buffer_minutes": self.refresh_buffer_minutes,
+            "refresh_fraction": self.refresh_fraction,
             "token": {
                 "has_token": token_info['has_token'],
                 "is_expired": token_info['is_expired'],
@@ -224,15 +350,14 @@ class SmartTokenWarmer:
                 "username": token_info['username']
             },
             "schedule": {
-                "expires_at": self.schedule.expires_at.isoformat() if self.schedule.expires_at else None,
-                "refresh_at": self.schedule.refresh_at.isoformat() if self.schedule.refresh_at else None,
+                **self._schedule_status,
                 "next_refresh_in_minutes": None
             }
         }
         
         # Calculate time until next refresh
-        if self.schedule.refresh_at and self.running:
-            time_until_refresh = (self.schedule.refresh_at - now).total_seconds() / 60
+        if self._refresh_deadline is not None and self.running:
+            time_until_refresh = (self._refresh_deadline - time.monotonic()) / 60
             status["schedule"]["next_refresh_in_minutes"] = max(0, time_until_refresh)
         
         return status
@@ -243,13 +368,17 @@ class SmartTokenWarmer:
             logger.warning("Cannot force refresh - pre-warming not active")
             return False
             
-        logger.info("🔧 Manual token refresh triggered")
-        
-        # Cancel scheduled refresh and do immediate refresh
-        self.cancel_scheduled_refresh()
+        if self._refresh_lock.locked():
+            # The in-flight refresh may have started before whatever prompted this request,
+            # so queue a forced refresh to run right after it instead of coalescing into it
+            logger.info("Token refresh already in progress - manual refresh will run after it")
+        else:
+            logger.info("Manual token refresh triggered")
         
-        # Run refresh in separate thread to avoid blocking
-        refresh_thread = threading.Thread(target=self.refresh_token, daemon=True)
-        refresh_thread.start()
+        # Replace the scheduled refresh with an immediate forced one on the scheduler thread
+        with self._cv:
+            self._force_pending = True
+            self._wake_deadline = time.monotonic()
+            self._cv.notify()
         
         return True
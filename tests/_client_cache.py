@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Shared authenticated NSP client for the test scripts
+Caches the NSP token on disk so repeated test runs skip the logon round-trip
+"""
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add local-server to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../local-server'))
+
+from nsp_client import NSPClient, AuthToken
+
+TOKEN_CACHE_DIR = Path.home() / '.cache' / 'nsp_mcp'
+
+def _token_cache_path(base_url: str, username: str, password: str) -> Path:
+    """Token cache file for one NSP server and set of credentials"""
+    # The password is part of the key so a changed or wrong password never reuses an old token
+    key = hashlib.sha256(f"{base_url.rstrip('/')}|{username}|{password}".encode()).hexdigest()[:16]
+    return TOKEN_CACHE_DIR / f"token_{key}.json"
+
+def _load_cached_token(path: Path) -> AuthToken:
+    """Read a cached token, or return an empty one if there is none"""
+    try:
+        data = json.loads(path.read_text())
+        return AuthToken(token=data['token'], expires=data['expires'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return AuthToken()
+
+def _save_token(path: Path, token: AuthToken):
+    """Write the token to the cache file, readable only by the current user"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({"token": token.token, "expires": token.expires}, f)
+    except OSError as e:
+        print(f"⚠️  Could not cache NSP token: {e}")
+
+def get_authenticated_client(base_url: str, username: str, password: str) -> NSPClient:
+    """Create an NSP client, reusing a cached token while it is still valid"""
+    client = NSPClient(base_url=base_url, username=username, password=password)
+    path = _token_cache_path(base_url, username, password)
+
+    # is_expired() also treats tokens expiring within the next 5 minutes as expired
+    cached = _load_cached_token(path)
+    if cached.token and not cached.is_expired():
+        client.auth_token = cached
+        client.session.headers['Authorization'] = f'Bearer {cached.token}'
+        return client
+
+    if client.authenticate():
+        _save_token(path, client.auth_token)
+    return client
+
+def save_client_token(client: NSPClient):
+    """Write the client's current token back to the cache, e.g. after it was renewed during a run"""
+    if client.auth_token.token and not client.auth_token.is_expired():
+        _save_token(_token_cache_path(client.base_url, client.username, client.password), client.auth_token)
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP session for the test scripts that call the local server
+One keep-alive session per process so repeated calls reuse their connections
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_session = None
+
+def get_local_session() -> requests.Session:
+    """Return the process-wide session, creating it with a small pool and retries on first use"""
+    global _session
+    if _session is None:
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                              max_retries=Retry(total=2, backoff_factor=0.1))
+        _session = requests.Session()
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+    return _session
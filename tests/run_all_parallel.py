@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Run the non-interactive test scripts in parallel
+Each script still runs in its own process; output is printed per script when it finishes
+"""
+
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(TESTS_DIR)
+
+# test_cache.py and test_token_prewarming.py wait for Enter, so they are run by hand
+SCRIPTS = [
+    'test_local_server_consolidated.py',
+    'test_user_scenarios_consolidated.py',
+    'test_nsp_direct.py',
+    'test_azure_function_consolidated.py',
+]
+
+def find_env_file():
+    """Return the first existing .env file, searched in the same order as the Azure Function tests"""
+    candidates = [
+        os.path.join(PROJECT_ROOT, 'local-server', '.env'),
+        os.path.join(PROJECT_ROOT, '.env'),
+        os.path.join(os.getcwd(), 'local-server', '.env'),
+        os.path.join(os.getcwd(), '.env')
+    ]
+    return next((path for path in candidates if os.path.exists(path)), None)
+
+def run_script(script: str, env: dict):
+    """Run one test script from the tests directory and capture its output"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, script],
+        cwd=TESTS_DIR,  # The scripts load ../local-server/.env relative to cwd
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    return script, result.returncode, result.stdout + result.stderr, time.perf_counter() - start
+
+def main():
+    """Run all scripts and return the highest exit code"""
+    start = time.perf_counter()
+    results = {}
+
+    # Resolve the .env file once; scripts that honour NSP_MCP_ENV_FILE load it without searching
+    env = dict(os.environ)
+    env_file = env.get('NSP_MCP_ENV_FILE') or find_env_file()
+    if env_file:
+        env['NSP_MCP_ENV_FILE'] = env_file
+
+    # Workers only wait on child processes, so threads are enough here
+    with ThreadPoolExecutor(max_workers=len(SCRIPTS)) as executor:
+        futures = [executor.submit(run_script, script, env) for script in SCRIPTS]
+        for future in as_completed(futures):
+            script, returncode, output, duration = future.result()
+            results[script] = returncode
+            print("=" * 60)
+            print(f"📄 {script} (exit {returncode}, {duration:.1f}s)")
+            print("=" * 60)
+            print(output)
+
+    print("=" * 60)
+    print("📊 Summary")
+    print("=" * 60)
+    for script in SCRIPTS:
+        status = "✅ PASSED" if results[script] == 0 else "❌ FAILED"
+        print(f"{status}: {script}")
+    print(f"\n⏱️  Total time: {time.perf_counter() - start:.1f}s")
+
+    return max(results.values())
+
+if __name__ == "__main__":
+    sys.exit(main())
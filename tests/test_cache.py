@@ -4,11 +4,11 @@ Test script for user cache functionality
 Run this to verify that the cache is working correctly
 """
 
-import requests
 import json
 import time
 import os
 from dotenv import load_dotenv
+from _local_session import get_local_session
 
 # Load environment variables from local-server directory
 load_dotenv('../local-server/.env')
@@ -16,6 +16,9 @@ load_dotenv('../local-server/.env')
 # Configuration
 LOCAL_SERVER_URL = "http://localhost:5000"
 
+# One keep-alive session for all calls against the local server
+_HTTP = get_local_session()
+
 # Get test user emails from environment variables
 TEST_USER_EMAIL = os.getenv('TEST_USER_EMAIL')
 TEST_CUSTOMER_1_EMAIL = os.getenv('TEST_CUSTOMER_1_EMAIL')
@@ -97,7 +100,7 @@ def test_cache_functionality():
     # Test 1: Check health endpoint includes cache stats
     print("\n1. Testing health endpoint with cache stats...")
     try:
-        response = requests.get(f"{LOCAL_SERVER_URL}/health")
+        response = _HTTP.get(f"{LOCAL_SERVER_URL}/health")
         if response.status_code == 200:
             data = response.json()
             if "user_cache" in data:
@@ -131,7 +134,7 @@ def test_cache_functionality():
     # Test 2: Get initial cache stats
     print("\n2. Getting initial cache stats...")
     try:
-        response = requests.get(f"{LOCAL_SERVER_URL}/api/cache/stats")
+        response = _HTTP.get(f"{LOCAL_SERVER_URL}/api/cache/stats")
         if response.status_code == 200:
             initial_stats = response.json()["data"]
             print("✅ Cache stats retrieved")
@@ -155,7 +158,7 @@ def test_cache_functionality():
     # Test 3: Clear cache
     print("\n3. Clearing cache...")
     try:
-        response = requests.post(f"{LOCAL_SERVER_URL}/api/cache/clear")
+        response = _HTTP.post(f"{LOCAL_SERVER_URL}/api/cache/clear")
         if response.status_code == 200:
             print("✅ Cache cleared successfully")
         else:
@@ -167,7 +170,7 @@ def test_cache_functionality():
     print(f"\n4. First user lookup (cache miss): {TEST_EMAIL}")
     start_time = time.time()
     try:
-        response = requests.post(
+        response = _HTTP.post(
             f"{LOCAL_SERVER_URL}/api/get_user_by_email",
             json={"email": TEST_EMAIL}
         )
@@ -194,7 +197,7 @@ def test_cache_functionality():
     print(f"\n5. Second user lookup (cache hit): {TEST_EMAIL}")
     start_time = time.time()
     try:
-        response = requests.post(
+        response = _HTTP.post(
             f"{LOCAL_SERVER_URL}/api/get_user_by_email",
             json={"email": TEST_EMAIL}
         )
@@ -225,7 +228,7 @@ def test_cache_functionality():
     # Test 6: Check cache stats after lookups
     print("\n6. Checking cache stats after lookups...")
     try:
-        response = requests.get(f"{LOCAL_SERVER_URL}/api/cache/stats")
+        response = _HTTP.get(f"{LOCAL_SERVER_URL}/api/cache/stats")
         if response.status_code == 200:
             final_stats = response.json()["data"]
             print("✅ Final cache stats retrieved")
@@ -250,7 +253,7 @@ def test_cache_functionality():
         
         # Add a likely non-existent email to test failure handling
         warm_emails.append("system.health@example.com")
-        response = requests.post(
+        response = _HTTP.post(
             f"{LOCAL_SERVER_URL}/api/cache/warm",
             json={"emails": warm_emails}
         )
@@ -294,4 +297,7 @@ if __name__ == "__main__":
     print("\nPress Enter to continue or Ctrl+C to cancel...")
     input()
     
-    test_cache_functionality()
+    try:
+        test_cache_functionality()
+    finally:
+        _HTTP.close()
@@ -4,10 +4,13 @@ Consolidated test script for local server testing
 Combines: test_local_server.py, test_local_server_direct.py, test_ticket_creation.py
 """
 
-import requests
+import asyncio
+import httpx
 import json
-import time
+import orjson
 import os
+from contextvars import ContextVar
+from typing import List, Optional
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -16,84 +19,113 @@ load_dotenv('../local-server/.env')
 # Configuration
 LOCAL_SERVER_URL = "http://localhost:5000"
 
+# Fail fast when the server isn't listening, but leave room for slow NSP operations
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=3.0)
+
+# Request bodies are sent as pre-encoded JSON
+CLIENT_HEADERS = {"Content-Type": "application/json"}
+
+# One pooled client is shared by all tests; keep enough keep-alive connections for the concurrent batch
+CLIENT_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+
 # Get test user emails from environment variables
 TEST_USER_EMAIL = os.getenv('TEST_USER_EMAIL')
 TEST_CUSTOMER_1_EMAIL = os.getenv('TEST_CUSTOMER_1_EMAIL')
 TEST_CUSTOMER_2_EMAIL = os.getenv('TEST_CUSTOMER_2_EMAIL')
 
-def test_health_check():
+# Output lines of the test running in the current task; concurrent tests each get their own
+# buffer, which run_test prints as one block so their output doesn't interleave
+_test_output: ContextVar[Optional[List[str]]] = ContextVar('_test_output', default=None)
+
+def log(message: str = ""):
+    """Record a line of test output"""
+    lines = _test_output.get()
+    if lines is None:
+        print(message)
+    else:
+        lines.append(message)
+
+def _json(response):
+    """Decode a JSON response body with orjson"""
+    return orjson.loads(response.content)
+
+def _error_snippet(response, limit=512):
+    """Return the start of an error response body for display"""
+    return response.content[:limit].decode('utf-8', 'replace')
+
+async def test_health_check(client):
     """Test health check endpoint"""
-    print("🧪 Testing health check...")
+    log("🧪 Testing health check...")
     
     try:
-        response = requests.get(f"{LOCAL_SERVER_URL}/health")
-        print(f"Status: {response.status_code}")
+        response = await client.get("/health")
+        log(f"Status: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
-            print(f"Service: {result.get('service')}")
-            print(f"Authenticated: {result.get('authenticated')}")
+            result = _json(response)
+            log(f"Service: {result.get('service')}")
+            log(f"Authenticated: {result.get('authenticated')}")
             if 'token_info' in result:
                 token_info = result['token_info']
-                print(f"Token status: has_token={token_info.get('has_token')}, is_expired={token_info.get('is_expired')}")
+                log(f"Token status: has_token={token_info.get('has_token')}, is_expired={token_info.get('is_expired')}")
             return True
         else:
-            print(f"❌ Error: {response.text}")
+            log(f"❌ Error: {_error_snippet(response)}")
             return False
     except Exception as e:
-        print(f"❌ Error: {e}")
+        log(f"❌ Error: {e}")
         return False
 
-def test_token_status():
+async def test_token_status(client):
     """Test token status endpoint"""
-    print("\n🧪 Testing token status...")
+    log("\n🧪 Testing token status...")
     
     try:
-        response = requests.get(f"{LOCAL_SERVER_URL}/api/token/status")
-        print(f"Status: {response.status_code}")
+        response = await client.get("/api/token/status")
+        log(f"Status: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = _json(response)
             if result.get('success'):
                 token_info = result.get('data', {})
-                print(f"Token info: {token_info}")
+                log(f"Token info: {token_info}")
                 return True
             else:
-                print(f"❌ Error: {result.get('error')}")
+                log(f"❌ Error: {result.get('error')}")
                 return False
         else:
-            print(f"❌ Error: {response.text}")
+            log(f"❌ Error: {_error_snippet(response)}")
             return False
     except Exception as e:
-        print(f"❌ Error: {e}")
+        log(f"❌ Error: {e}")
         return False
 
-def test_token_refresh():
+async def test_token_refresh(client):
     """Test manual token refresh"""
-    print("\n🧪 Testing token refresh...")
+    log("\n🧪 Testing token refresh...")
     
     try:
-        response = requests.post(f"{LOCAL_SERVER_URL}/api/token/refresh")
-        print(f"Status: {response.status_code}")
+        response = await client.post("/api/token/refresh")
+        log(f"Status: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = _json(response)
             if result.get('success'):
-                print("✅ Token refreshed successfully")
+                log("✅ Token refreshed successfully")
                 return True
             else:
-                print(f"❌ Error: {result.get('error')}")
+                log(f"❌ Error: {result.get('error')}")
                 return False
         else:
-            print(f"❌ Error: {response.text}")
+            log(f"❌ Error: {_error_snippet(response)}")
             return False
     except Exception as e:
-        print(f"❌ Error: {e}")
+        log(f"❌ Error: {e}")
         return False
 
-def test_get_tickets():
+async def test_get_tickets(client):
     """Test fetching tickets"""
-    print("\n🧪 Testing get_tickets...")
+    log("\n🧪 Testing get_tickets...")
     
     try:
         data = {
@@ -101,34 +133,33 @@ def test_get_tickets():
             "page_size": 5
         }
         
-        response = requests.post(
-            f"{LOCAL_SERVER_URL}/api/get_tickets",
-            json=data,
-            headers={"Content-Type": "application/json"}
+        response = await client.post(
+            "/api/get_tickets",
+            content=orjson.dumps(data)
         )
         
-        print(f"Status: {response.status_code}")
+        log(f"Status: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = _json(response)
             if result.get('success'):
                 tickets = result.get('data', [])
-                print(f"✅ Successfully retrieved {len(tickets)} tickets")
+                log(f"✅ Successfully retrieved {len(tickets)} tickets")
                 return True
             else:
-                print(f"❌ Error: {result.get('error')}")
+                log(f"❌ Error: {result.get('error')}")
                 return False
         else:
-            print(f"❌ Error: {response.text}")
+            log(f"❌ Error: {_error_snippet(response)}")
             return False
     except Exception as e:
-        print(f"❌ Error: {e}")
+        log(f"❌ Error: {e}")
         return False
 
-def test_get_tickets_with_different_filters():
+async def test_get_tickets_with_different_filters(client):
     """Test get_tickets with different filter formats"""
-    print("\n🔍 Testing get_tickets with Different Filters")
-    print("=" * 60)
+    log("\n🔍 Testing get_tickets with Different Filters")
+    log("=" * 60)
     
     test_cases = [
         {
@@ -167,65 +198,68 @@ def test_get_tickets_with_different_filters():
         }
     ]
     
+    # The filter variants are independent probes: send them together, report in order
+    responses = await asyncio.gather(
+        *(client.post("/api/get_tickets", content=orjson.dumps(test_case['data']), timeout=15.0)
+          for test_case in test_cases),
+        return_exceptions=True
+    )
+    
     all_passed = True
     
-    for test_case in test_cases:
-        print(f"\n🧪 Testing: {test_case['name']}")
-        print(f"   Data: {json.dumps(test_case['data'], indent=2)}")
+    for test_case, response in zip(test_cases, responses):
+        log(f"\n🧪 Testing: {test_case['name']}")
+        log(f"   Data: {json.dumps(test_case['data'], indent=2)}")
         
         try:
-            response = requests.post(
-                f"{LOCAL_SERVER_URL}/api/get_tickets",
-                json=test_case['data'],
-                headers={"Content-Type": "application/json"},
-                timeout=15.0
-            )
+            if isinstance(response, Exception):
+                raise response
             
-            print(f"   Status: {response.status_code}")
+            log(f"   Status: {response.status_code}")
             
             if response.status_code == 200:
-                result = response.json()
-                print(f"   ✅ Success!")
-                print(f"   Has Data: {'data' in result}")
+                result = _json(response)
+                log(f"   ✅ Success!")
+                log(f"   Has Data: {'data' in result}")
                 if 'data' in result:
-                    print(f"   Data count: {len(result['data'])}")
+                    log(f"   Data count: {len(result['data'])}")
             else:
-                print(f"   ❌ Error: {response.text}")
+                log(f"   ❌ Error: {_error_snippet(response)}")
                 all_passed = False
                 
         except Exception as e:
-            print(f"   ❌ Exception: {e}")
+            log(f"   ❌ Exception: {e}")
             all_passed = False
     
     return all_passed
 
-def test_get_entity_types():
+async def test_get_entity_types(client):
     """Test getting entity types"""
-    print("\n🧪 Testing get_entity_types...")
+    log("\n🧪 Testing get_entity_types...")
     
     try:
-        response = requests.get(f"{LOCAL_SERVER_URL}/api/get_entity_types")
-        print(f"Status: {response.status_code}")
+        response = await client.get("/api/get_entity_types")
+        log(f"Status: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = _json(response)
             if result.get('success'):
                 entity_types = result.get('data', [])
-                print(f"✅ Successfully retrieved {len(entity_types)} entity types")
+                log(f"✅ Successfully retrieved {len(entity_types)} entity types")
                 return True
             else:
-                print(f"❌ Error: {result.get('error')}")
+                log(f"❌ Error: {result.get('error')}")
                 return False
         else:
-            print(f"❌ Error: {response.text}")
+            log(f"❌ Error: {_error_snippet(response)}")
             return False
     except Exception as e:
-        print(f"❌ Error: {e}")
+        log(f"❌ Error: {e}")
         return False
 
-def test_search_entities():
+async def test_search_entities(client):
     """Test searching entities"""
-    print("\n🧪 Testing search_entities...")
+    log("\n🧪 Testing search_entities...")
     
     try:
         data = {
@@ -235,35 +269,34 @@ def test_search_entities():
             "page_size": 5
         }
         
-        response = requests.post(
-            f"{LOCAL_SERVER_URL}/api/search_entities",
-            json=data,
-            headers={"Content-Type": "application/json"}
+        response = await client.post(
+            "/api/search_entities",
+            content=orjson.dumps(data)
         )
         
-        print(f"Status: {response.status_code}")
+        log(f"Status: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = _json(response)
             if result.get('success'):
                 entities = result.get('data', [])
-                print(f"✅ Successfully found {len(entities)} entities")
+                log(f"✅ Successfully found {len(entities)} entities")
                 if len(entities) == 0:
-                    print("   Note: Search functionality may not be fully implemented yet")
+                    log("   Note: Search functionality may not be fully implemented yet")
                 return True
             else:
-                print(f"❌ Error: {result.get('error')}")
+                log(f"❌ Error: {result.get('error')}")
                 return False
         else:
-            print(f"❌ Error: {response.text}")
+            log(f"❌ Error: {_error_snippet(response)}")
             return False
     except Exception as e:
-        print(f"❌ Error: {e}")
+        log(f"❌ Error: {e}")
         return False
 
-def test_create_ticket_with_user():
+async def test_create_ticket_with_user(client):
     """Test creating ticket with user context"""
-    print("\n🧪 Testing create_ticket with user context...")
+    log("\n🧪 Testing create_ticket with user context...")
     
     try:
         data = {
@@ -281,34 +314,33 @@ def test_create_ticket_with_user():
             "role": "customer"  # Always customer when creating tickets
         }
         
-        response = requests.post(
-            f"{LOCAL_SERVER_URL}/api/create_ticket_with_role",
-            json=data,
-            headers={"Content-Type": "application/json"}
+        response = await client.post(
+            "/api/create_ticket_with_role",
+            content=orjson.dumps(data)
         )
         
-        print(f"Status: {response.status_code}")
+        log(f"Status: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = _json(response)
             if result.get('success'):
-                print(f"✅ Ticket created successfully")
-                print(f"Created for user: {result.get('user_email')}")
+                log(f"✅ Ticket created successfully")
+                log(f"Created for user: {result.get('user_email')}")
                 return True
             else:
-                print(f"❌ Error: {result.get('error')}")
+                log(f"❌ Error: {result.get('error')}")
                 return False
         else:
-            print(f"❌ Error: {response.text}")
+            log(f"❌ Error: {_error_snippet(response)}")
             return False
             
     except Exception as e:
-        print(f"❌ Error: {e}")
+        log(f"❌ Error: {e}")
         return False
 
-def test_create_ticket_with_role():
+async def test_create_ticket_with_role(client):
     """Test creating ticket with user role"""
-    print("\n🧪 Testing create_ticket_with_role...")
+    log("\n🧪 Testing create_ticket_with_role...")
     
     try:
         data = {
@@ -326,38 +358,37 @@ def test_create_ticket_with_role():
             "role": "customer"
         }
         
-        response = requests.post(
-            f"{LOCAL_SERVER_URL}/api/create_ticket_with_role",
-            json=data,
-            headers={"Content-Type": "application/json"}
+        response = await client.post(
+            "/api/create_ticket_with_role",
+            content=orjson.dumps(data)
         )
         
-        print(f"Status: {response.status_code}")
+        log(f"Status: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = _json(response)
             if result.get('success'):
-                print(f"✅ Ticket created successfully")
-                print(f"Created for user: {result.get('user_email')}")
-                print(f"User role: {result.get('user_role')}")
+                log(f"✅ Ticket created successfully")
+                log(f"Created for user: {result.get('user_email')}")
+                log(f"User role: {result.get('user_role')}")
                 return True
             else:
-                print(f"❌ Error: {result.get('error')}")
+                log(f"❌ Error: {result.get('error')}")
                 return False
         else:
-            print(f"❌ Error: {response.text}")
+            log(f"❌ Error: {_error_snippet(response)}")
             return False
             
     except Exception as e:
-        print(f"❌ Error: {e}")
+        log(f"❌ Error: {e}")
         return False
 
-def test_update_ticket_with_user():
+async def test_update_ticket_with_user(client):
     """Test updating ticket with user context"""
-    print("\n🧪 Testing update_ticket with user context...")
+    log("\n🧪 Testing update_ticket with user context...")
     
     # First create a ticket to update
-    print("   Creating ticket for update test...")
+    log("   Creating ticket for update test...")
     create_data = {
         "ticket_data": {
             "EntityType": "Ticket",
@@ -374,27 +405,26 @@ def test_update_ticket_with_user():
     }
     
     try:
-        create_response = requests.post(
-            f"{LOCAL_SERVER_URL}/api/create_ticket_with_role",
-            json=create_data,
-            headers={"Content-Type": "application/json"}
+        create_response = await client.post(
+            "/api/create_ticket_with_role",
+            content=orjson.dumps(create_data)
         )
         
         if create_response.status_code != 200:
-            print(f"❌ Failed to create ticket for update test: {create_response.text}")
+            log(f"❌ Failed to create ticket for update test: {_error_snippet(create_response)}")
             return False
         
-        create_result = create_response.json()
+        create_result = _json(create_response)
         if not create_result.get('success'):
-            print(f"❌ Failed to create ticket for update test: {create_result.get('error')}")
+            log(f"❌ Failed to create ticket for update test: {create_result.get('error')}")
             return False
         
         ticket_id = create_result.get('data')
         if not ticket_id:
-            print("❌ Could not extract ticket ID from created ticket")
+            log("❌ Could not extract ticket ID from created ticket")
             return False
         
-        print(f"   Created ticket ID: {ticket_id}")
+        log(f"   Created ticket ID: {ticket_id}")
         
         # Now update the ticket
         update_data = {
@@ -406,66 +436,64 @@ def test_update_ticket_with_user():
             "role": "agent"
         }
         
-        update_response = requests.put(
-            f"{LOCAL_SERVER_URL}/api/update_ticket_with_role/{ticket_id}",
-            json=update_data,
-            headers={"Content-Type": "application/json"}
+        update_response = await client.put(
+            f"/api/update_ticket_with_role/{ticket_id}",
+            content=orjson.dumps(update_data)
         )
         
-        print(f"Update Status: {update_response.status_code}")
+        log(f"Update Status: {update_response.status_code}")
         
         if update_response.status_code == 200:
-            update_result = update_response.json()
+            update_result = _json(update_response)
             if update_result.get('success'):
-                print(f"✅ Ticket updated successfully")
+                log(f"✅ Ticket updated successfully")
                 return True
             else:
-                print(f"❌ Error: {update_result.get('error')}")
+                log(f"❌ Error: {update_result.get('error')}")
                 return False
         else:
-            print(f"❌ Error: {update_response.text}")
+            log(f"❌ Error: {_error_snippet(update_response)}")
             return False
             
     except Exception as e:
-        print(f"❌ Error: {e}")
+        log(f"❌ Error: {e}")
         return False
 
-def test_get_user_by_email():
+async def test_get_user_by_email(client):
     """Test getting user by email"""
-    print("\n🧪 Testing get_user_by_email...")
+    log("\n🧪 Testing get_user_by_email...")
     
     try:
         data = {"email": TEST_USER_EMAIL}
         
-        response = requests.post(
-            f"{LOCAL_SERVER_URL}/api/get_user_by_email",
-            json=data,
-            headers={"Content-Type": "application/json"}
+        response = await client.post(
+            "/api/get_user_by_email",
+            content=orjson.dumps(data)
         )
         
-        print(f"Status: {response.status_code}")
+        log(f"Status: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = _json(response)
             if result.get('success'):
                 user_data = result.get('data', {})
-                print(f"✅ Successfully retrieved user data")
-                print(f"User ID: {user_data.get('Id')}")
-                print(f"User email: {user_data.get('Email')}")
+                log(f"✅ Successfully retrieved user data")
+                log(f"User ID: {user_data.get('Id')}")
+                log(f"User email: {user_data.get('Email')}")
                 return True
             else:
-                print(f"❌ Error: {result.get('error')}")
+                log(f"❌ Error: {result.get('error')}")
                 return False
         else:
-            print(f"❌ Error: {response.text}")
+            log(f"❌ Error: {_error_snippet(response)}")
             return False
     except Exception as e:
-        print(f"❌ Error: {e}")
+        log(f"❌ Error: {e}")
         return False
 
-def test_get_tickets_by_role():
+async def test_get_tickets_by_role(client):
     """Test getting tickets by user role"""
-    print("\n🧪 Testing get_tickets_by_role...")
+    log("\n🧪 Testing get_tickets_by_role...")
     
     try:
         data = {
@@ -475,33 +503,32 @@ def test_get_tickets_by_role():
             "page_size": 5
         }
         
-        response = requests.post(
-            f"{LOCAL_SERVER_URL}/api/get_tickets_by_role",
-            json=data,
-            headers={"Content-Type": "application/json"}
+        response = await client.post(
+            "/api/get_tickets_by_role",
+            content=orjson.dumps(data)
         )
         
-        print(f"Status: {response.status_code}")
+        log(f"Status: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = _json(response)
             if result.get('success'):
                 tickets = result.get('data', [])
-                print(f"✅ Successfully retrieved {len(tickets)} tickets for user role")
+                log(f"✅ Successfully retrieved {len(tickets)} tickets for user role")
                 return True
             else:
-                print(f"❌ Error: {result.get('error')}")
+                log(f"❌ Error: {result.get('error')}")
                 return False
         else:
-            print(f"❌ Error: {response.text}")
+            log(f"❌ Error: {_error_snippet(response)}")
             return False
     except Exception as e:
-        print(f"❌ Error: {e}")
+        log(f"❌ Error: {e}")
         return False
 
-def test_create_and_update_ticket():
+async def test_create_and_update_ticket(client):
     """Test creating and then updating a ticket"""
-    print("\n🧪 Testing create and update ticket workflow...")
+    log("\n🧪 Testing create and update ticket workflow...")
     
     try:
         # Create ticket
@@ -520,26 +547,22 @@ def test_create_and_update_ticket():
             "role": "customer"
         }
         
-        create_response = requests.post(
-            f"{LOCAL_SERVER_URL}/api/create_ticket_with_role",
-            json=create_data,
-            headers={"Content-Type": "application/json"}
+        create_response = await client.post(
+            "/api/create_ticket_with_role",
+            content=orjson.dumps(create_data)
         )
         
         if create_response.status_code != 200:
-            print(f"❌ Failed to create ticket: {create_response.text}")
+            log(f"❌ Failed to create ticket: {_error_snippet(create_response)}")
             return False
         
-        create_result = create_response.json()
+        create_result = _json(create_response)
         if not create_result.get('success'):
-            print(f"❌ Failed to create ticket: {create_result.get('error')}")
+            log(f"❌ Failed to create ticket: {create_result.get('error')}")
             return False
         
         ticket_id = create_result.get('data')
-        print(f"✅ Created ticket ID: {ticket_id}")
-        
-        # Wait a moment before updating
-        time.sleep(1)
+        log(f"✅ Created ticket ID: {ticket_id}")
         
         # Update ticket
         update_data = {
@@ -551,67 +574,94 @@ def test_create_and_update_ticket():
             "role": "agent"
         }
         
-        update_response = requests.put(
-            f"{LOCAL_SERVER_URL}/api/update_ticket_with_role/{ticket_id}",
-            json=update_data,
-            headers={"Content-Type": "application/json"}
+        update_response = await client.put(
+            f"/api/update_ticket_with_role/{ticket_id}",
+            content=orjson.dumps(update_data)
         )
         
         if update_response.status_code == 200:
-            update_result = update_response.json()
+            update_result = _json(update_response)
             if update_result.get('success'):
-                print(f"✅ Ticket updated successfully")
+                log(f"✅ Ticket updated successfully")
                 return True
             else:
-                print(f"❌ Error updating ticket: {update_result.get('error')}")
+                log(f"❌ Error updating ticket: {update_result.get('error')}")
                 return False
         else:
-            print(f"❌ Error updating ticket: {update_response.text}")
+            log(f"❌ Error updating ticket: {_error_snippet(update_response)}")
             return False
             
     except Exception as e:
-        print(f"❌ Error: {e}")
+        log(f"❌ Error: {e}")
         return False
 
-def main():
+async def run_test(test_name, test_func, client):
+    """Run a single test and report its outcome as one block of output"""
+    # Printed live, so a hung test shows up as started even though its output is still buffered
+    print(f"▶️  {test_name} started")
+    lines = []
+    _test_output.set(lines)
+    try:
+        if await test_func(client):
+            log(f"✅ {test_name} PASSED")
+            return True
+        log(f"❌ {test_name} FAILED")
+    except asyncio.CancelledError:
+        # Timeouts and Ctrl+C cancel the task; the buffered output is still printed below
+        log(f"⏹️  {test_name} interrupted")
+        raise
+    except Exception as e:
+        log(f"❌ {test_name} FAILED with exception: {e}")
+        import traceback
+        log(traceback.format_exc())
+    finally:
+        print("\n".join(lines))
+    return False
+
+async def main():
     """Run all local server tests"""
     print("🚀 Local Server Tests")
     print("=" * 60)
     
-    tests = [
-        ("Health Check", test_health_check),
-        ("Token Status", test_token_status),
-        ("Token Refresh", test_token_refresh),
-        ("Get Tickets", test_get_tickets),
-        ("Get Tickets with Filters", test_get_tickets_with_different_filters),
-        ("Get Entity Types", test_get_entity_types),
-        ("Search Entities", test_search_entities),
-        ("Create Ticket with User", test_create_ticket_with_user),
-        ("Create Ticket with Role", test_create_ticket_with_role),
-        ("Update Ticket with User", test_update_ticket_with_user),
-        ("Get User by Email", test_get_user_by_email),
-        ("Get Tickets by Role", test_get_tickets_by_role),
-        ("Create and Update Ticket", test_create_and_update_ticket)
+    # Tests run in concurrent batches. Token refresh runs on its own between the read-only
+    # batch and the ticket writes; each write test keeps its own create -> update steps in order
+    test_batches = [
+        ("read-only", [
+            ("Health Check", test_health_check),
+            ("Token Status", test_token_status),
+            ("Get Tickets", test_get_tickets),
+            ("Get Tickets with Filters", test_get_tickets_with_different_filters),
+            ("Get Entity Types", test_get_entity_types),
+            ("Search Entities", test_search_entities),
+            ("Get User by Email", test_get_user_by_email),
+            ("Get Tickets by Role", test_get_tickets_by_role)
+        ]),
+        ("token", [
+            ("Token Refresh", test_token_refresh)
+        ]),
+        ("ticket write", [
+            ("Create Ticket with User", test_create_ticket_with_user),
+            ("Create Ticket with Role", test_create_ticket_with_role),
+            ("Update Ticket with User", test_update_ticket_with_user),
+            ("Create and Update Ticket", test_create_and_update_ticket)
+        ])
     ]
     
     passed = 0
-    total = len(tests)
+    total = sum(len(tests) for _, tests in test_batches)
     
-    for test_name, test_func in tests:
-        print(f"\n{'='*60}")
-        print(f"🧪 {test_name}")
-        print(f"{'='*60}")
-        
-        try:
-            if test_func():
-                print(f"✅ {test_name} PASSED")
-                passed += 1
-            else:
-                print(f"❌ {test_name} FAILED")
-        except Exception as e:
-            print(f"❌ {test_name} FAILED with exception: {e}")
-            import traceback
-            traceback.print_exc()
+    async with httpx.AsyncClient(base_url=LOCAL_SERVER_URL, headers=CLIENT_HEADERS, limits=CLIENT_LIMITS,
+                                 timeout=DEFAULT_TIMEOUT) as client:
+        for batch_name, tests in test_batches:
+            print(f"\n{'='*60}")
+            print(f"🧪 Running {len(tests)} {batch_name} test(s)")
+            print(f"{'='*60}")
+            
+            results = await asyncio.gather(
+                *(run_test(name, func, client) for name, func in tests),
+                return_exceptions=True
+            )
+            passed += sum(result is True for result in results)
     
     print(f"\n{'='*60}")
     print(f"📊 Test Results: {passed}/{total} tests passed")
@@ -625,4 +675,4 @@ def main():
         return 1
 
 if __name__ == "__main__":
-    exit(main()) 
\ No newline at end of file
+    exit(asyncio.run(main())) 
\ No newline at end of file
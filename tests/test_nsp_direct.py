@@ -5,35 +5,81 @@ Combines: test_simple.py, test_nsp_client_direct.py, test_numeric_ids.py, test_i
 """
 
 import os
-import sys
 import time
 import json
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import dotenv_values
 
-# Add local-server to path
-sys.path.append('../local-server')
-
-# Load environment variables
-load_dotenv('../local-server/.env')
+# Snapshot of the .env file, parsed once; real environment variables take precedence
+_ENV = {**dotenv_values('../local-server/.env'), **os.environ}
 
 # Configuration from environment variables
-NSP_BASE_URL = os.getenv('NSP_BASE_URL')
-NSP_USERNAME = os.getenv('NSP_USERNAME')
-NSP_PASSWORD = os.getenv('NSP_PASSWORD')
-TEST_USER_EMAIL = os.getenv('TEST_USER_EMAIL')
+NSP_BASE_URL = _ENV.get('NSP_BASE_URL')
+NSP_USERNAME = _ENV.get('NSP_USERNAME')
+NSP_PASSWORD = _ENV.get('NSP_PASSWORD')
+TEST_USER_EMAIL = _ENV.get('TEST_USER_EMAIL')
+
+# Ticket columns requested by the connectivity check, built once
+_TICKET_COLUMNS = (
+    "Type", "Owner", "Version", "CreatedDate", "CreatedBy", "UpdatedDate", "UpdatedBy",
+    "IPAddress", "BaseStatus", "OwnerAgent", "CC", "Priority", "Category", "Callback",
+    "CloseDateTime", "AgentGroup", "EndUserRating", "IsMajor", "BaseEntitySource",
+    "GeoLocation", "BrowserName", "ReferenceNo", "BaseEntityStage", "Escalation",
+    "Resolution", "BaseEntitySecurity", "IsSecurity", "FormId", "CaseType", "ReportedBy",
+    "OnBehalfOf", "BaseEndUser", "BaseAgent", "BaseHeader", "BaseDescription",
+    "BaseEntityStatus", "Location", "Customer", "SspFormId", "RequesterCommentCount",
+    "EndUserCommentCount", "SlaSummary", "MainWaypoint", "Urgency", "Impact", "AssignedDate",
+    "Address", "CommentCount", "LastCommentUserType", "ServiceEntitiesCount", "CiCount",
+    "TaskCount", "TicketOrganization", "ScenarioName", "EntitySerialNumber", "ConversationId",
+    "ServiceOrderItemId", "MasterTicket", "DependentParent", "IsInvoiceable", "IsInvoicingDecisionMade",
+    "ServiceCiId", "ServiceCiCategoryId", "SlaStartTimeCounter", "JiraIssueKey", "MetaDataOrderInfoId",
+    "StartMeetingTime", "EndMeetingTime", "RecipientAs", "AttachmentCount", "CiId", "CrmReference",
+    "MarkedForDelete", "EmailOrigin", "IsClosedFromSsp"
+)
+
+# Connectivity check query: the first page of tickets with all columns
+_CONNECTIVITY_QUERY = {
+    "EntityType": "Ticket",
+    "Page": 1,
+    "PageSize": 5,
+    "columns": list(_TICKET_COLUMNS)
+}
 
-# Global NSP client instance
-nsp_client = None
+# Shared NSP client instance, created on first use. If creating it fails, the error is
+# kept so later tests fail straight away instead of each retrying a cold login
+_nsp_client = None
+_nsp_client_error = None
+
+def get_nsp_client():
+    """Return the shared NSP client so every test reuses one session and token"""
+    global _nsp_client, _nsp_client_error
+    if _nsp_client_error is not None:
+        raise RuntimeError(f"NSP client unavailable (skipped, setup failed earlier): {_nsp_client_error}")
+    if _nsp_client is None:
+        try:
+            from _client_cache import get_authenticated_client
+            client = get_authenticated_client(NSP_BASE_URL, NSP_USERNAME, NSP_PASSWORD)
+            if not client.auth_token.token:
+                raise RuntimeError("NSP authentication failed")
+        except Exception as e:
+            _nsp_client_error = e
+            raise
+        _nsp_client = client
+    return _nsp_client
 
 def test_environment():
     """Test that environment variables are loaded"""
     print("🔧 Testing environment configuration...")
     
-    required_vars = ['NSP_BASE_URL', 'NSP_USERNAME', 'NSP_PASSWORD']
+    # Check the values read once at import, which are the ones the NSP client is built from
+    required_vars = {
+        'NSP_BASE_URL': NSP_BASE_URL,
+        'NSP_USERNAME': NSP_USERNAME,
+        'NSP_PASSWORD': NSP_PASSWORD
+    }
     missing_vars = []
     
-    for var in required_vars:
-        value = os.getenv(var)
+    for var, value in required_vars.items():
         if not value or value.startswith('your_'):
             missing_vars.append(var)
         else:
@@ -52,12 +98,10 @@ def test_nsp_connectivity():
     print("\n🌐 Testing NSP API connectivity...")
     
     try:
-        from nsp_client import NSPClient
+        # Create (or reuse) the shared client
+        client = get_nsp_client()
         
-        # Create client
-        client = NSPClient(base_url=NSP_BASE_URL, username=NSP_USERNAME, password=NSP_PASSWORD)
-        
-        # Test authentication
+        # Log in explicitly so the configured credentials are checked, not just a cached token
         print("   Testing authentication...")
         auth_result = client.authenticate()
         
@@ -66,35 +110,10 @@ def test_nsp_connectivity():
             
             # Test a simple API call
             print("   Testing basic API call...")
-            test_data = {
-                "EntityType": "Ticket",
-                "Page": 1,
-                "PageSize": 5,
-                "columns": [
-                    "Type", "Owner", "Version", "CreatedDate", "CreatedBy", "UpdatedDate", "UpdatedBy", 
-                    "IPAddress", "BaseStatus", "OwnerAgent", "CC", "Priority", "Category", "Callback", 
-                    "CloseDateTime", "AgentGroup", "EndUserRating", "IsMajor", "BaseEntitySource", 
-                    "GeoLocation", "BrowserName", "ReferenceNo", "BaseEntityStage", "Escalation", 
-                    "Resolution", "BaseEntitySecurity", "IsSecurity", "FormId", "CaseType", "ReportedBy", 
-                    "OnBehalfOf", "BaseEndUser", "BaseAgent", "BaseHeader", "BaseDescription", 
-                    "BaseEntityStatus", "Location", "Customer", "SspFormId", "RequesterCommentCount", 
-                    "EndUserCommentCount", "SlaSummary", "MainWaypoint", "Urgency", "Impact", "AssignedDate", 
-                    "Address", "CommentCount", "LastCommentUserType", "ServiceEntitiesCount", "CiCount", 
-                    "TaskCount", "TicketOrganization", "ScenarioName", "EntitySerialNumber", "ConversationId", 
-                    "ServiceOrderItemId", "MasterTicket", "DependentParent", "IsInvoiceable", "IsInvoicingDecisionMade", 
-                    "ServiceCiId", "ServiceCiCategoryId", "SlaStartTimeCounter", "JiraIssueKey", "MetaDataOrderInfoId", 
-                    "StartMeetingTime", "EndMeetingTime", "RecipientAs", "AttachmentCount", "CiId", "CrmReference", 
-                    "MarkedForDelete", "EmailOrigin", "IsClosedFromSsp"
-                ]
-            }
-            result = client._make_request('POST', 'GetEntityListByQuery', test_data)
+            result = client._make_request('POST', 'GetEntityListByQuery', _CONNECTIVITY_QUERY)
             
             if result and result.get('Data') is not None:
                 print(f"✅ API call successful! Found {len(result.get('Data', []))} tickets")
-                
-                # Store client globally for other tests
-                global nsp_client
-                nsp_client = client
                 return True
             else:
                 print("❌ API call failed or returned no data")
@@ -112,8 +131,9 @@ def test_nsp_connectivity():
 def test_get_entity_metadata():
     """Test getting entity metadata to understand required fields"""
     print("\n🧪 Testing entity metadata retrieval...")
-    
     try:
+        nsp_client = get_nsp_client()
+        
         # Get metadata for Ticket entity
         metadata = nsp_client.get_entity_metadata("Ticket")
         
@@ -152,8 +172,9 @@ def test_get_entity_metadata():
 def test_get_available_ids():
     """Test the new ID fetching functions"""
     print("\n🧪 Testing ID fetching functions...")
-    
     try:
+        nsp_client = get_nsp_client()
+        
         # Test priority IDs
         print("   Testing priority IDs...")
         priority_ids = nsp_client.get_priority_ids()
@@ -188,8 +209,9 @@ def test_get_available_ids():
 def test_create_ticket_direct():
     """Test creating a ticket directly via NSP API"""
     print("\n🧪 Testing direct ticket creation via NSP API...")
-    
     try:
+        nsp_client = get_nsp_client()
+        
         # Test ticket data - using minimal required fields
         ticket_data = {
             "EntityType": "Ticket",
@@ -240,8 +262,9 @@ def test_create_ticket_direct():
 def test_create_ticket_with_user_context():
     """Test creating a ticket with user context"""
     print("\n🧪 Testing ticket creation with user context...")
-    
     try:
+        nsp_client = get_nsp_client()
+        
         # Test ticket data
         ticket_data = {
             "title": "User Context Test Ticket",
@@ -277,16 +300,14 @@ def test_numeric_id_filtering():
     # Test 1: Get all IT tickets (should use numeric IDs internally)
     print("\n📋 Test 1: Getting all IT tickets...")
     try:
+        nsp_client = get_nsp_client()
         result = nsp_client.get_it_tickets(page=1, page_size=5)
         if result and result.get('Data'):
             print(f"✅ Successfully retrieved {len(result['Data'])} IT tickets")
             print(f"   Total available: {result.get('Total', 'Unknown')}")
             
             # Show ticket types found
-            types_found = set()
-            for ticket in result['Data']:
-                if 'Type' in ticket:
-                    types_found.add(ticket['Type'])
+            types_found = {ticket.get('Type') for ticket in result['Data']} - {None}
             print(f"   Ticket types found: {types_found}")
         else:
             print("❌ No data returned or unexpected response structure")
@@ -303,10 +324,7 @@ def test_numeric_id_filtering():
             print(f"✅ Successfully retrieved {len(result['Data'])} tickets (Ticket + Incident only, page_size=20)")
             
             # Verify only requested types are returned
-            types_found = set()
-            for ticket in result['Data']:
-                if 'Type' in ticket:
-                    types_found.add(ticket['Type'])
+            types_found = {ticket.get('Type') for ticket in result['Data']} - {None}
             print(f"   Ticket types found: {types_found}")
         else:
             print("❌ No data returned for specific ticket types")
@@ -321,72 +339,38 @@ def test_it_tickets_filtering():
     print("\n🧪 Testing IT Tickets Filtering")
     print("=" * 50)
     
+    # Each probe is an independent query, so they share the authenticated
+    # client and run concurrently; results are printed in order afterwards
+    probes = [
+        ("Test 1: Get all IT tickets (default)", "IT tickets",
+         lambda: nsp_client.get_it_tickets(page=1, page_size=5)),
+        ("Test 2: Get only IT Requests", "IT Request tickets",
+         lambda: nsp_client.get_it_tickets(page=1, page_size=5, ticket_types=['Ticket'])),
+        ("Test 3: Get only Service Orders", "Service Order tickets",
+         lambda: nsp_client.get_it_tickets(page=1, page_size=5, ticket_types=['ServiceOrderRequest'])),
+        ("Test 4: Get only Incidents", "Incident tickets",
+         lambda: nsp_client.get_it_tickets(page=1, page_size=5, ticket_types=['Incident'])),
+        ("Test 5: Get open IT tickets only", "open IT tickets",
+         lambda: nsp_client.get_it_tickets_by_status(status="open", page=1, page_size=5)),
+        ("Test 6: Get closed IT tickets only", "closed IT tickets",
+         lambda: nsp_client.get_it_tickets_by_status(status="closed", page=1, page_size=5))
+    ]
+    
     try:
-        # Test 1: Get all IT tickets (default behavior)
-        print("\n📋 Test 1: Get all IT tickets (default)")
-        print("-" * 30)
-        result = nsp_client.get_it_tickets(page=1, page_size=5)
-        tickets = result.get('Data', [])
-        print(f"✅ Found {len(tickets)} IT tickets")
-        
-        # Show ticket types found
-        types_found = set(ticket.get('Type') for ticket in tickets)
-        print(f"📊 Ticket types found: {types_found}")
-        
-        # Test 2: Get only IT Requests
-        print("\n📋 Test 2: Get only IT Requests")
-        print("-" * 30)
-        result = nsp_client.get_it_tickets(
-            page=1, 
-            page_size=5, 
-            ticket_types=['Ticket']
-        )
-        tickets = result.get('Data', [])
-        print(f"✅ Found {len(tickets)} IT Request tickets")
-        
-        # Test 3: Get only Service Orders
-        print("\n📋 Test 3: Get only Service Orders")
-        print("-" * 30)
-        result = nsp_client.get_it_tickets(
-            page=1, 
-            page_size=5, 
-            ticket_types=['ServiceOrderRequest']
-        )
-        tickets = result.get('Data', [])
-        print(f"✅ Found {len(tickets)} Service Order tickets")
-        
-        # Test 4: Get only Incidents
-        print("\n📋 Test 4: Get only Incidents")
-        print("-" * 30)
-        result = nsp_client.get_it_tickets(
-            page=1, 
-            page_size=5, 
-            ticket_types=['Incident']
-        )
-        tickets = result.get('Data', [])
-        print(f"✅ Found {len(tickets)} Incident tickets")
-        
-        # Test 5: Get open tickets only
-        print("\n📋 Test 5: Get open IT tickets only")
-        print("-" * 30)
-        result = nsp_client.get_it_tickets_by_status(
-            status="open",
-            page=1, 
-            page_size=5
-        )
-        tickets = result.get('Data', [])
-        print(f"✅ Found {len(tickets)} open IT tickets")
-        
-        # Test 6: Get closed tickets only
-        print("\n📋 Test 6: Get closed IT tickets only")
-        print("-" * 30)
-        result = nsp_client.get_it_tickets_by_status(
-            status="closed",
-            page=1, 
-            page_size=5
-        )
-        tickets = result.get('Data', [])
-        print(f"✅ Found {len(tickets)} closed IT tickets")
+        nsp_client = get_nsp_client()
+        with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+            results = list(executor.map(lambda probe: probe[2](), probes))
+        
+        for index, ((title, label, _), result) in enumerate(zip(probes, results)):
+            print(f"\n📋 {title}")
+            print("-" * 30)
+            tickets = result.get('Data', [])
+            print(f"✅ Found {len(tickets)} {label}")
+            
+            # Show ticket types found for the default query
+            if index == 0:
+                types_found = set(ticket.get('Type') for ticket in tickets)
+                print(f"📊 Ticket types found: {types_found}")
         
         return True
         
@@ -429,6 +413,11 @@ def main():
             import traceback
             traceback.print_exc()
     
+    # Keep the (possibly renewed) token for the next run
+    if _nsp_client is not None:
+        from _client_cache import save_client_token
+        save_client_token(_nsp_client)
+    
     print(f"\n{'='*60}")
     print(f"📊 Test Results: {passed}/{total} tests passed")
     print(f"{'='*60}")
@@ -4,11 +4,11 @@ Test script for token pre-warming functionality
 Run this to verify that the token pre-warming system is working correctly
 """
 
-import requests
 import json
 import time
 import os
 from dotenv import load_dotenv
+from _local_session import get_local_session
 from datetime import datetime, timezone
 
 # Load environment variables from local-server directory
@@ -17,6 +17,12 @@ load_dotenv('../local-server/.env')
 # Configuration
 LOCAL_SERVER_URL = "http://localhost:5000"
 
+# One keep-alive session for all calls against the local server
+_HTTP = get_local_session()
+
+# Optional pause (seconds) between back-to-back calls, for throttled environments
+TEST_PACING = float(os.getenv('NSP_TEST_PACING', '0'))
+
 def check_prewarming_config():
     """Check and display pre-warming configuration"""
     print("\n🔧 Pre-warming Configuration Check")
@@ -24,9 +30,11 @@ def check_prewarming_config():
     
     prewarming_enabled = os.getenv('PREWARMING_ENABLED', 'true').lower() == 'true'
     refresh_buffer = os.getenv('PREWARMING_REFRESH_BUFFER', '5')
+    refresh_fraction = os.getenv('PREWARMING_REFRESH_FRACTION', '0.5')
     
     print(f"PREWARMING_ENABLED: {'✅ Enabled' if prewarming_enabled else '❌ Disabled'}")
     print(f"PREWARMING_REFRESH_BUFFER: {refresh_buffer} minutes")
+    print(f"PREWARMING_REFRESH_FRACTION: {refresh_fraction}")
     
     if not prewarming_enabled:
         print("\n⚠️  Pre-warming is disabled!")
@@ -39,7 +47,7 @@ def test_prewarming_status():
     """Test pre-warming status endpoint"""
     print("\n1. Testing pre-warming status...")
     try:
-        response = requests.get(f"{LOCAL_SERVER_URL}/api/prewarming/status")
+        response = _HTTP.get(f"{LOCAL_SERVER_URL}/api/prewarming/status")
         
         if response.status_code == 200:
             data = response.json()
@@ -84,7 +92,7 @@ def test_health_with_prewarming():
     """Test health endpoint includes pre-warming info"""
     print("\n2. Testing health endpoint with pre-warming info...")
     try:
-        response = requests.get(f"{LOCAL_SERVER_URL}/health")
+        response = _HTTP.get(f"{LOCAL_SERVER_URL}/health")
         
         if response.status_code == 200:
             data = response.json()
@@ -109,7 +117,7 @@ def test_force_refresh():
     print("\n3. Testing manual token refresh...")
     try:
         print("   Triggering manual refresh...")
-        response = requests.post(f"{LOCAL_SERVER_URL}/api/prewarming/refresh")
+        response = _HTTP.post(f"{LOCAL_SERVER_URL}/api/prewarming/refresh")
         
         if response.status_code == 200:
             result = response.json()
@@ -123,7 +131,7 @@ def test_force_refresh():
                 
                 # Check status after refresh
                 print("   Checking status after refresh...")
-                status_response = requests.get(f"{LOCAL_SERVER_URL}/api/prewarming/status")
+                status_response = _HTTP.get(f"{LOCAL_SERVER_URL}/api/prewarming/status")
                 if status_response.status_code == 200:
                     status_data = status_response.json()
                     if status_data["success"]:
@@ -151,19 +159,20 @@ def test_prewarming_control():
     try:
         # Test stop
         print("   Testing stop...")
-        response = requests.post(f"{LOCAL_SERVER_URL}/api/prewarming/stop")
+        response = _HTTP.post(f"{LOCAL_SERVER_URL}/api/prewarming/stop")
         if response.status_code == 200:
             result = response.json()
             print(f"   ✅ Stop: {result['message']}")
         else:
             print(f"   ❌ Stop failed: {response.status_code}")
         
-        # Brief pause
-        time.sleep(1)
+        # Optional pause
+        if TEST_PACING:
+            time.sleep(TEST_PACING)
         
         # Test start
         print("   Testing start...")
-        response = requests.post(f"{LOCAL_SERVER_URL}/api/prewarming/start")
+        response = _HTTP.post(f"{LOCAL_SERVER_URL}/api/prewarming/start")
         if response.status_code == 200:
             result = response.json()
             print(f"   ✅ Start: {result['message']}")
@@ -185,7 +194,7 @@ def test_token_persistence():
         
         try:
             # Make a simple API call that requires authentication
-            response = requests.get(f"{LOCAL_SERVER_URL}/api/cache/stats")
+            response = _HTTP.get(f"{LOCAL_SERVER_URL}/api/cache/stats")
             call_time = time.time() - start_time
             call_times.append(call_time)
             
@@ -199,9 +208,9 @@ def test_token_persistence():
             call_times.append(call_time)
             print(f"     ❌ Error in {call_time:.2f}s: {e}")
         
-        # Small delay between calls
-        if i < 2:
-            time.sleep(1)
+        # Optional delay between calls
+        if TEST_PACING and i < 2:
+            time.sleep(TEST_PACING)
     
     # Analyze timing
     if len(call_times) >= 2:
@@ -264,4 +273,7 @@ if __name__ == "__main__":
     print("\nPress Enter to continue or Ctrl+C to cancel...")
     input()
     
-    test_prewarming_functionality()
+    try:
+        test_prewarming_functionality()
+    finally:
+        _HTTP.close()
@@ -4,16 +4,20 @@ Consolidated test script for user scenarios and user-friendly functions
 Combines: test_user_scenario.py, test_user_friendly_functions.py
 """
 
+import io
 import os
 import sys
 import requests
-import json
+import orjson
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from functools import lru_cache
 from typing import Dict, Any, Optional
+from dotenv import dotenv_values
 
-# Add local-server to path for imports
-sys.path.append('../local-server')
-
+# _client_cache puts local-server on the path, so import it before nsp_client
+from _client_cache import get_authenticated_client, save_client_token
 from nsp_client import NSPClient
 
 # Import the filtering helpers from azure-function directory
@@ -34,6 +38,9 @@ from nsp_filtering_helpers import (
     get_stage_name
 )
 
+# Set NSP_TEST_VERBOSE=1 to print raw and per-ticket sample output
+VERBOSE = bool(os.getenv('NSP_TEST_VERBOSE'))
+
 def print_header(title: str):
     """Print a formatted header"""
     print(f"\n{'='*60}")
@@ -56,8 +63,9 @@ def print_info(message: str):
     """Print info message"""
     print(f"ℹ️  {message}")
 
+@lru_cache(maxsize=1)
 def load_environment():
-    """Load environment variables from env file"""
+    """Load environment variables from env file (parsed once per run)"""
     env_file = '../local-server/.env'  # Use .env file
     
     if not os.path.exists(env_file):
@@ -65,15 +73,17 @@ def load_environment():
         print_info("Please create env.test file with your NSP configuration")
         return None
     
-    env_vars = {}
-    with open(env_file, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                env_vars[key] = value
-    
-    return env_vars
+    return dict(dotenv_values(env_file))
+
+# Shared NSP client instance, created and authenticated on first use
+_nsp_client = None
+
+def get_nsp_client(env: Dict[str, str]) -> NSPClient:
+    """Return the shared NSP client so the scenarios reuse one session and token"""
+    global _nsp_client
+    if _nsp_client is None:
+        _nsp_client = get_authenticated_client(env['NSP_BASE_URL'], env['NSP_USERNAME'], env['NSP_PASSWORD'])
+    return _nsp_client
 
 def test_user_scenario():
     """Test complete user scenario: auth -> user lookup -> ticket listing"""
@@ -98,11 +108,7 @@ def test_user_scenario():
     # Initialize NSP client
     print_step("Initializing NSP client...")
     try:
-        client = NSPClient(
-            base_url=env['NSP_BASE_URL'],
-            username=env['NSP_USERNAME'],
-            password=env['NSP_PASSWORD']
-        )
+        client = get_nsp_client(env)
         print_success("NSP client initialized")
     except Exception as e:
         print_error(f"Failed to initialize NSP client: {e}")
@@ -111,6 +117,7 @@ def test_user_scenario():
     # Step 1: Authenticate
     print_step("Step 1: Authenticating with NSP API...")
     try:
+        # Log in explicitly so the configured credentials are checked, not just a cached token
         if client.authenticate():
             print_success("Authentication successful")
             token_info = client.get_token_info()
@@ -128,7 +135,8 @@ def test_user_scenario():
         user_email = env['TEST_USER_EMAIL']
         print_info(f"Looking up user: {user_email}")
         
-        # Search for user in Person entity
+        # Query NSP directly (not the client's cached lookup, which turns errors into None)
+        # so an API failure is reported separately from a missing user
         search_data = {
             "EntityType": "Person",
             "Page": 1,
@@ -174,12 +182,13 @@ def test_user_scenario():
             print_success(f"Found {len(tickets)} tickets for user")
             
             # Display ticket summaries
-            for i, ticket in enumerate(tickets[:5]):  # Show first 5
-                formatted = format_ticket_summary(ticket)
-                print_info(f"Ticket {i+1}: {formatted.get('title', 'No title')} - {formatted.get('status', 'Unknown status')}")
-            
-            if len(tickets) > 5:
-                print_info(f"... and {len(tickets) - 5} more tickets")
+            if VERBOSE:
+                for i, ticket in enumerate(tickets[:5]):  # Show first 5
+                    formatted = format_ticket_summary(ticket)
+                    print_info(f"Ticket {i+1}: {formatted.get('title', 'No title')} - {formatted.get('status', 'Unknown status')}")
+                
+                if len(tickets) > 5:
+                    print_info(f"... and {len(tickets) - 5} more tickets")
         else:
             print_info("No tickets found for user")
     except Exception as e:
@@ -265,12 +274,13 @@ def test_ticket_formatting():
         "Priority": "Medium"
     }
     
-    print("\nOriginal ticket data:")
-    print(json.dumps(sample_ticket, indent=2, ensure_ascii=False))
+    if VERBOSE:
+        print("\nOriginal ticket data:")
+        print(orjson.dumps(sample_ticket, option=orjson.OPT_INDENT_2).decode())
     
     print("\nFormatted ticket:")
     formatted = format_ticket_summary(sample_ticket)
-    print(json.dumps(formatted, indent=2, ensure_ascii=False))
+    print(orjson.dumps(formatted, option=orjson.OPT_INDENT_2).decode())
     
     return True
 
@@ -341,31 +351,45 @@ def test_real_world_scenario():
         return False
     
     try:
-        # Initialize NSP client
-        client = NSPClient(
-            base_url=env['NSP_BASE_URL'],
-            username=env['NSP_USERNAME'],
-            password=env['NSP_PASSWORD']
-        )
+        # Reuse the shared NSP client (authenticates only if it has no valid token yet)
+        client = get_nsp_client(env)
         
         # Authenticate
-        if not client.authenticate():
+        if not client.ensure_valid_token():
             print_error("Authentication failed")
             return False
         
         print_success("Connected to NSP")
         
+        user_email = env.get('TEST_USER_EMAIL')
+        
+        def get_user_tickets():
+            """Look up the test user, then fetch their tickets (None if the user can't be resolved)"""
+            user_result = client.get_user_by_email(user_email)
+            user_id = user_result.get('Id') if user_result else None
+            if not user_id:
+                return user_result, None
+            my_filter = create_my_tickets_filter(user_email, user_id)
+            return user_result, client.get_it_tickets(page=1, page_size=5, filters=my_filter)
+        
+        # The three queries are independent, so run them concurrently on the shared client
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            open_future = executor.submit(client.get_it_tickets, page=1, page_size=5,
+                                          filters=create_open_tickets_filter())
+            status_future = executor.submit(client.get_it_tickets, page=1, page_size=5,
+                                            filters=create_simple_status_filter("Assigned"))
+            user_future = executor.submit(get_user_tickets) if user_email else None
+        
         # Test 1: Get open tickets
         print_step("Getting open tickets...")
-        open_filter = create_open_tickets_filter()
-        result = client.get_it_tickets(page=1, page_size=5, filters=open_filter)
+        result = open_future.result()
         
         if result and result.get('Data'):
             tickets = result['Data']
             print_success(f"Found {len(tickets)} open tickets")
             
             # Format and display first ticket
-            if tickets:
+            if VERBOSE and tickets:
                 formatted = format_ticket_summary(tickets[0])
                 print_info(f"Sample ticket: {formatted}")
         else:
@@ -373,8 +397,7 @@ def test_real_world_scenario():
         
         # Test 2: Get tickets by status
         print_step("Getting tickets by status...")
-        status_filter = create_simple_status_filter("Assigned")
-        result = client.get_it_tickets(page=1, page_size=5, filters=status_filter)
+        result = status_future.result()
         
         if result and result.get('Data'):
             tickets = result['Data']
@@ -384,21 +407,14 @@ def test_real_world_scenario():
         
         # Test 3: Search for specific user's tickets
         print_step("Searching for user's tickets...")
-        user_email = env.get('TEST_USER_EMAIL')
-        if user_email:
-            # First get the user ID
-            user_result = client.get_user_by_email(user_email)
-            if user_result:
-                user_id = user_result.get('Id')
-                if user_id:
-                    my_filter = create_my_tickets_filter(user_email, user_id)
-                    result = client.get_it_tickets(page=1, page_size=5, filters=my_filter)
-                else:
-                    print_error(f"Could not get user ID for {user_email}")
-                    return False
-            else:
+        if user_future:
+            user_result, result = user_future.result()
+            if not user_result:
                 print_error(f"User not found: {user_email}")
                 return False
+            if result is None:
+                print_error(f"Could not get user ID for {user_email}")
+                return False
             
             if result and result.get('Data'):
                 tickets = result['Data']
@@ -430,20 +446,30 @@ def main():
     total = len(tests)
     
     for test_name, test_func in tests:
-        print(f"\n{'='*60}")
-        print(f"🧪 {test_name}")
-        print(f"{'='*60}")
+        # Collect each test's output and write it in one go instead of line by line
+        output = io.StringIO()
+        with redirect_stdout(output):
+            print(f"\n{'='*60}")
+            print(f"🧪 {test_name}")
+            print(f"{'='*60}")
+            
+            try:
+                if test_func():
+                    print(f"✅ {test_name} PASSED")
+                    passed += 1
+                else:
+                    print(f"❌ {test_name} FAILED")
+            except Exception as e:
+                print(f"❌ {test_name} FAILED with exception: {e}")
+                import traceback
+                traceback.print_exc(file=sys.stdout)
         
-        try:
-            if test_func():
-                print(f"✅ {test_name} PASSED")
-                passed += 1
-            else:
-                print(f"❌ {test_name} FAILED")
-        except Exception as e:
-            print(f"❌ {test_name} FAILED with exception: {e}")
-            import traceback
-            traceback.print_exc()
+        sys.stdout.write(output.getvalue())
+        sys.stdout.flush()
+    
+    # Keep the (possibly renewed) token for the next run
+    if _nsp_client is not None:
+        save_client_token(_nsp_client)
     
     print(f"\n{'='*60}")
     print(f"📊 Test Results: {passed}/{total} tests passed")